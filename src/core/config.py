@@ -2,6 +2,7 @@
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
+import copy
 import os
 
 from .database import Database
@@ -26,20 +27,33 @@ class Config:
             db: Database instance
         """
         self.db = db
+        self._settings_cache: Optional[Settings] = None
         load_dotenv()
     
     def get_settings(self) -> Settings:
-        """Load settings from database or return defaults."""
-        included_paths = self.db.get_setting('included_paths', [])
-        allowed_ext = self.db.get_setting('allowed_ext', self.DEFAULT_ALLOWED_EXT)
-        embedding_model = self.db.get_setting('embedding_model', self.DEFAULT_EMBEDDING_MODEL)
-        generation_mode_str = self.db.get_setting('generation_mode', self.DEFAULT_GENERATION_MODE.value)
-        chunk_size = self.db.get_setting('chunk_size', self.DEFAULT_CHUNK_SIZE)
-        chunk_overlap = self.db.get_setting('chunk_overlap', self.DEFAULT_CHUNK_OVERLAP)
-        top_k = self.db.get_setting('top_k', self.DEFAULT_TOP_K)
+        """Load settings from database or return defaults.
+        
+        Settings are read once and cached until save_settings is called.
+        Each call returns a copy, so callers may modify it freely.
+        """
+        if self._settings_cache is None:
+            self._settings_cache = self._load_settings()
+        return copy.deepcopy(self._settings_cache)
+    
+    def _load_settings(self) -> Settings:
+        """Read settings from the database in one query."""
+        stored = self.db.get_all_settings()
+        
+        included_paths = stored.get('included_paths', [])
+        allowed_ext = stored.get('allowed_ext', self.DEFAULT_ALLOWED_EXT)
+        embedding_model = stored.get('embedding_model', self.DEFAULT_EMBEDDING_MODEL)
+        generation_mode_str = stored.get('generation_mode', self.DEFAULT_GENERATION_MODE.value)
+        chunk_size = stored.get('chunk_size', self.DEFAULT_CHUNK_SIZE)
+        chunk_overlap = stored.get('chunk_overlap', self.DEFAULT_CHUNK_OVERLAP)
+        top_k = stored.get('top_k', self.DEFAULT_TOP_K)
         
         # Get OpenAI API key from environment or database
-        openai_api_key = os.getenv('OPENAI_API_KEY') or self.db.get_setting('openai_api_key')
+        openai_api_key = os.getenv('OPENAI_API_KEY') or stored.get('openai_api_key')
         
         return Settings(
             included_paths=included_paths,
@@ -58,17 +72,23 @@ class Config:
         Args:
             settings: Settings object to save
         """
-        self.db.save_setting('included_paths', settings.included_paths)
-        self.db.save_setting('allowed_ext', settings.allowed_ext)
-        self.db.save_setting('embedding_model', settings.embedding_model)
-        self.db.save_setting('generation_mode', settings.generation_mode.value)
-        self.db.save_setting('chunk_size', settings.chunk_size)
-        self.db.save_setting('chunk_overlap', settings.chunk_overlap)
-        self.db.save_setting('top_k', settings.top_k)
+        self._settings_cache = None
+        
+        values = {
+            'included_paths': settings.included_paths,
+            'allowed_ext': settings.allowed_ext,
+            'embedding_model': settings.embedding_model,
+            'generation_mode': settings.generation_mode.value,
+            'chunk_size': settings.chunk_size,
+            'chunk_overlap': settings.chunk_overlap,
+            'top_k': settings.top_k
+        }
         
         # Only save API key to database if provided
         if settings.openai_api_key:
-            self.db.save_setting('openai_api_key', settings.openai_api_key)
+            values['openai_api_key'] = settings.openai_api_key
+        
+        self.db.save_settings_many(values)
     
     def add_included_path(self, path: str) -> None:
         """Add a path to included paths."""
@@ -3,8 +3,9 @@ import sqlite3
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from contextlib import contextmanager
+import threading
 import uuid
 
 from .models import (
@@ -13,143 +14,233 @@ from .models import (
 )
 from .tokenizer import get_tokenizer
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(value: any) -> str:
+    """Serialize a setting value to JSON text (orjson when installed).
+    
+    Non-str dict keys are converted to strings, as json.dumps does. Values
+    orjson cannot serialize fall back to json.dumps.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(value)
+
+
+def _loads(text: str) -> any:
+    """Parse a JSON setting value (orjson when installed).
+    
+    Falls back to json.loads for text orjson rejects, such as the NaN and
+    Infinity literals json.dumps writes.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+# Whole schema as one script, so it is sent to SQLite in a single call.
+# journal_mode cannot change inside a transaction, so it comes first.
+SCHEMA_SQL = """
+-- Write-ahead logging (persistent, stored in the database file)
+PRAGMA journal_mode = WAL;
+
+BEGIN;
+
+-- Documents table
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    error_message TEXT
+);
+
+-- Covering index for path lookups (get_document_by_path selects
+-- every column, so the lookup never has to visit the table)
+CREATE INDEX IF NOT EXISTS idx_documents_path_covering
+ON documents(path, id, title, ext, mtime, size, status, error_message);
+
+-- Chunks table
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    page INTEGER,
+    start_offset INTEGER NOT NULL,
+    end_offset INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
+);
+
+-- Create index on document_id for faster lookups
+CREATE INDEX IF NOT EXISTS idx_chunks_document_id
+ON chunks(document_id);
+
+-- FTS5 virtual table for full-text search
+-- Using unicode61 tokenizer for better Japanese support
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    text,
+    content='',
+    tokenize='unicode61 remove_diacritics 0'
+);
+
+-- Triggers to keep FTS5 in sync with tokenized text
+-- Note: INSERT is handled manually in add_chunk() for proper tokenization
+-- Only need triggers for DELETE and UPDATE
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES('delete', old.rowid, old.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES('delete', old.rowid, old.text);
+    INSERT INTO chunks_fts(rowid, text)
+    VALUES (new.rowid, new.text);
+END;
+
+-- Embeddings table
+CREATE TABLE IF NOT EXISTS embeddings (
+    chunk_id TEXT PRIMARY KEY,
+    vector_id INTEGER NOT NULL,
+    model_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    FOREIGN KEY (chunk_id) REFERENCES chunks(id) ON DELETE CASCADE
+);
+
+-- Index jobs table
+CREATE TABLE IF NOT EXISTS index_jobs (
+    id TEXT PRIMARY KEY,
+    target_path TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    total INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    error_count INTEGER NOT NULL,
+    log TEXT
+);
+
+-- Settings table
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+COMMIT;
+"""
+
 
 class Database:
     """SQLite database manager with FTS5 support."""
     
+    # Applied to every connection. WAL with synchronous=NORMAL avoids an
+    # fsync per commit while staying safe against corruption.
+    CONNECTION_PRAGMAS = (
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA busy_timeout = 5000",
+        "PRAGMA cache_size = -20000",
+    )
+    
+    # FTS5's own automerge default, used when none has been configured
+    FTS_DEFAULT_AUTOMERGE = 4
+    # Pages of FTS5 index merged after an incremental bulk ingest
+    BULK_MERGE_PAGES = 500
+    
     def __init__(self, db_path: str = "data/folderrag.db"):
         """Initialize database connection.
         
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, or ":memory:" for a
+                private in-memory database (useful for tests)
         """
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One long-lived connection per instance, so SQLite's statement
+        # cache is reused across calls. The lock serializes access when
+        # the instance is shared between threads.
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = self._connect()
+        
         self.tokenizer = get_tokenizer()
+        # Cached COUNT(*) results, cleared by writes through this instance
+        self._stats_cache: dict[str, int] = {}
+        # Chunks inserted through this instance, used by bulk_ingest
+        self._chunks_added = 0
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a configured connection to the database."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(";\n".join(self.CONNECTION_PRAGMAS))
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        """Context manager for database connections.
+        
+        Yields the instance's shared connection and commits (or rolls back
+        on error) when the block exits.
+        """
+        with self._lock:
+            if self._conn is None:
+                # Reopen after close(). An in-memory database comes back
+                # empty, so recreate the schema and drop cached counts.
+                self._conn = self._connect()
+                self._conn.executescript(SCHEMA_SQL)
+                self._stats_cache.clear()
+            conn = self._conn
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    @contextmanager
+    def _write_connection(self):
+        """Like get_connection, for writes that change row counts.
+        
+        Cached counts are cleared once the write has committed, while the
+        lock is still held, so no reader can re-cache the old value.
+        """
+        with self._lock:
+            with self.get_connection() as conn:
+                yield conn
+            self._stats_cache.clear()
     
     def _init_db(self):
         """Initialize database schema."""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Enable foreign keys
-            cursor.execute("PRAGMA foreign_keys = ON")
-            
-            # Documents table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS documents (
-                    id TEXT PRIMARY KEY,
-                    path TEXT UNIQUE NOT NULL,
-                    title TEXT NOT NULL,
-                    ext TEXT NOT NULL,
-                    mtime REAL NOT NULL,
-                    size INTEGER NOT NULL,
-                    status TEXT NOT NULL,
-                    error_message TEXT
-                )
-            """)
-            
-            # Chunks table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS chunks (
-                    id TEXT PRIMARY KEY,
-                    document_id TEXT NOT NULL,
-                    page INTEGER,
-                    start_offset INTEGER NOT NULL,
-                    end_offset INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    text_hash TEXT NOT NULL,
-                    FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Create index on document_id for faster lookups
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_chunks_document_id 
-                ON chunks(document_id)
-            """)
-            
-            # FTS5 virtual table for full-text search
-            # Using unicode61 tokenizer for better Japanese support
-            cursor.execute("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
-                    text,
-                    content='',
-                    tokenize='unicode61 remove_diacritics 0'
-                )
-            """)
-            
-            # Triggers to keep FTS5 in sync with tokenized text
-            # Note: INSERT is handled manually in add_chunk() for proper tokenization
-            # Only need triggers for DELETE and UPDATE
-            
-            cursor.execute("""
-                CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
-                    INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES('delete', old.rowid, old.text);
-                END
-            """)
-            
-            cursor.execute("""
-                CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
-                    INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES('delete', old.rowid, old.text);
-                    INSERT INTO chunks_fts(rowid, text)
-                    VALUES (new.rowid, new.text);
-                END
-            """)
-            
-            # Embeddings table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS embeddings (
-                    chunk_id TEXT PRIMARY KEY,
-                    vector_id INTEGER NOT NULL,
-                    model_name TEXT NOT NULL,
-                    created_at REAL NOT NULL,
-                    FOREIGN KEY (chunk_id) REFERENCES chunks(id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Index jobs table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS index_jobs (
-                    id TEXT PRIMARY KEY,
-                    target_path TEXT NOT NULL,
-                    started_at REAL NOT NULL,
-                    finished_at REAL,
-                    total INTEGER NOT NULL,
-                    done INTEGER NOT NULL,
-                    error_count INTEGER NOT NULL,
-                    log TEXT
-                )
-            """)
-            
-            # Settings table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                )
-            """)
+            conn.executescript(SCHEMA_SQL)
     
     # Document operations
     def add_document(self, document: Document) -> None:
         """Add a document to the database."""
-        with self.get_connection() as conn:
+        with self._write_connection() as conn:
             conn.execute("""
                 INSERT INTO documents (id, path, title, ext, mtime, size, status, error_message)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
@@ -164,6 +255,38 @@ class Database:
                 document.error_message
             ))
     
+    def add_documents(self, documents: Iterable[Document]) -> None:
+        """Add many documents to the database in one transaction.
+        
+        Same storage as add_document, but all rows are written with
+        executemany; if any row fails, none are added.
+        
+        Args:
+            documents: Documents to add
+        """
+        documents = list(documents)
+        if not documents:
+            return
+        
+        with self._write_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("""
+                INSERT INTO documents (id, path, title, ext, mtime, size, status, error_message)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    document.id,
+                    document.path,
+                    document.title,
+                    document.ext,
+                    document.mtime.timestamp(),
+                    document.size,
+                    document.status.value,
+                    document.error_message
+                )
+                for document in documents
+            ])
+    
     def get_document(self, document_id: str) -> Optional[Document]:
         """Get a document by ID."""
         with self.get_connection() as conn:
@@ -188,7 +311,8 @@ class Database:
         """Get a document by file path."""
         with self.get_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM documents WHERE path = ?", (path,)
+                "SELECT * FROM documents INDEXED BY idx_documents_path_covering WHERE path = ?",
+                (path,)
             ).fetchone()
             
             if row:
@@ -233,7 +357,7 @@ class Database:
     
     def delete_document(self, document_id: str) -> None:
         """Delete a document and its chunks."""
-        with self.get_connection() as conn:
+        with self._write_connection() as conn:
             conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
     
     def get_all_documents(self) -> List[Document]:
@@ -273,7 +397,7 @@ class Database:
         The text is stored as-is in chunks table.
         For FTS5, we manually tokenize for Japanese support.
         """
-        with self.get_connection() as conn:
+        with self._write_connection() as conn:
             # Insert into chunks table with original text
             cursor = conn.execute("""
                 INSERT INTO chunks (id, document_id, page, start_offset, end_offset, text, text_hash)
@@ -299,6 +423,104 @@ class Database:
                 INSERT INTO chunks_fts(rowid, text)
                 VALUES (?, ?)
             """, (rowid, tokenized_text))
+            self._chunks_added += 1
+    
+    def add_chunks(self, chunks: Iterable[Chunk]) -> None:
+        """Add many chunks to the database in one transaction.
+        
+        Same storage as add_chunk, but all rows are written with
+        executemany inside a single transaction instead of one commit
+        per chunk.
+        
+        Args:
+            chunks: Chunks to add
+        """
+        chunks = list(chunks)
+        if not chunks:
+            return
+        
+        # Tokenize text for FTS5 (Japanese support) before taking the lock
+        tokenized_texts = [self.tokenizer.tokenize(chunk.text) for chunk in chunks]
+        
+        with self._write_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            
+            # executemany has no per-row lastrowid, so assign rowids
+            # explicitly while holding the write lock
+            start_rowid = conn.execute(
+                "SELECT COALESCE(MAX(rowid), 0) FROM chunks"
+            ).fetchone()[0] + 1
+            
+            conn.executemany("""
+                INSERT INTO chunks (rowid, id, document_id, page, start_offset, end_offset, text, text_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    start_rowid + i,
+                    chunk.id,
+                    chunk.document_id,
+                    chunk.page,
+                    chunk.start_offset,
+                    chunk.end_offset,
+                    chunk.text,  # Store original text
+                    chunk.text_hash
+                )
+                for i, chunk in enumerate(chunks)
+            ])
+            
+            conn.executemany("""
+                INSERT INTO chunks_fts(rowid, text)
+                VALUES (?, ?)
+            """, [
+                (start_rowid + i, tokenized_text)
+                for i, tokenized_text in enumerate(tokenized_texts)
+            ])
+            self._chunks_added += len(chunks)
+    
+    @contextmanager
+    def bulk_ingest(self):
+        """Context manager that defers FTS5 index merging during bulk inserts.
+        
+        FTS5 normally merges its index segments incrementally as rows are
+        added. Inside this block automatic merging is turned off; when the
+        block exits the previous setting is restored and the new segments
+        are merged. If the block added most of the index (e.g. a first full
+        indexing run) the whole index is merged into one (``optimize``);
+        otherwise a bounded ``merge`` keeps the cost proportional to the
+        batch rather than the corpus.
+        
+        chunks_fts is contentless, so the FTS5 ``rebuild`` command (which
+        re-reads a content table) is not available; deferring merges is the
+        equivalent saving.
+        
+        Example:
+            with db.bulk_ingest():
+                db.add_chunks(chunks)
+        """
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT v FROM chunks_fts_config WHERE k = 'automerge'"
+            ).fetchone()
+            previous_automerge = row['v'] if row else self.FTS_DEFAULT_AUTOMERGE
+            added_before = self._chunks_added
+            conn.execute("INSERT INTO chunks_fts(chunks_fts, rank) VALUES('automerge', 0)")
+        try:
+            yield self
+        finally:
+            with self.get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO chunks_fts(chunks_fts, rank) VALUES('automerge', ?)",
+                    (previous_automerge,)
+                )
+                added = self._chunks_added - added_before
+                total = conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+                if added > 0 and added * 2 >= total:
+                    conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('optimize')")
+                elif added > 0:
+                    conn.execute(
+                        "INSERT INTO chunks_fts(chunks_fts, rank) VALUES('merge', ?)",
+                        (self.BULK_MERGE_PAGES,)
+                    )
     
     def get_chunk(self, chunk_id: str) -> Optional[Chunk]:
         """Get a chunk by ID."""
@@ -341,19 +563,37 @@ class Database:
     
     def delete_chunks_by_document(self, document_id: str) -> None:
         """Delete all chunks for a document."""
-        with self.get_connection() as conn:
+        with self._write_connection() as conn:
             conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
     
-    def get_chunk_count(self) -> int:
-        """Get total number of chunks."""
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT COUNT(*) as count FROM chunks").fetchone()
-            return row['count']
+    def get_chunk_count(self, use_cache: bool = False) -> int:
+        """Get total number of chunks.
+        
+        Args:
+            use_cache: Return the cached count if available. The cache only
+                sees writes made through this instance, so leave this off
+                when another instance or process may write.
+        """
+        return self._count('chunks', use_cache)
     
-    def get_document_count(self) -> int:
-        """Get total number of documents."""
+    def get_document_count(self, use_cache: bool = False) -> int:
+        """Get total number of documents.
+        
+        Args:
+            use_cache: Return the cached count if available. The cache only
+                sees writes made through this instance, so leave this off
+                when another instance or process may write.
+        """
+        return self._count('documents', use_cache)
+    
+    def _count(self, table: str, use_cache: bool) -> int:
+        """Count rows in a table, caching the result."""
         with self.get_connection() as conn:
-            row = conn.execute("SELECT COUNT(*) as count FROM documents").fetchone()
+            if use_cache and table in self._stats_cache:
+                return self._stats_cache[table]
+            
+            row = conn.execute(f"SELECT COUNT(*) as count FROM {table}").fetchone()
+            self._stats_cache[table] = row['count']
             return row['count']
     
     def get_all_documents(self) -> List[Document]:
@@ -507,7 +747,22 @@ class Database:
             conn.execute("""
                 INSERT OR REPLACE INTO settings (key, value)
                 VALUES (?, ?)
-            """, (key, json.dumps(value)))
+            """, (key, _dumps(value)))
+    
+    def save_settings_many(self, settings: dict) -> None:
+        """Save several settings in one transaction.
+        
+        Args:
+            settings: Mapping of setting key to value
+        """
+        if not settings:
+            return
+        
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO settings (key, value)
+                VALUES (?, ?)
+            """, [(key, _dumps(value)) for key, value in settings.items()])
     
     def get_setting(self, key: str, default: any = None) -> any:
         """Get a setting."""
@@ -517,11 +772,11 @@ class Database:
             ).fetchone()
             
             if row:
-                return json.loads(row['value'])
+                return _loads(row['value'])
             return default
     
     def get_all_settings(self) -> dict:
         """Get all settings as a dictionary."""
         with self.get_connection() as conn:
             rows = conn.execute("SELECT key, value FROM settings").fetchall()
-            return {row['key']: json.loads(row['value']) for row in rows}
+            return {row['key']: _loads(row['value']) for row in rows}
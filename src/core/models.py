@@ -1,5 +1,6 @@
 """Data models for the RAG application."""
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 from typing import Optional
 from enum import Enum
@@ -41,6 +42,11 @@ class Chunk:
     end_offset: int
     text: str
     text_hash: str
+    
+    @cached_property
+    def lower_text(self) -> str:
+        """Lowercase copy of the text, computed on first use."""
+        return self.text.lower()
 
 
 @dataclass
@@ -1,6 +1,8 @@
 """Text tokenization utilities for Japanese and multilingual support."""
 import re
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
 
 # Try to import MeCab, fall back to basic tokenization if not available
 try:
@@ -9,20 +11,97 @@ try:
 except ImportError:
     MECAB_AVAILABLE = False
 
+# Hiragana, Katakana, CJK Extension A, Kanji, CJK compatibility ideographs
+# and halfwidth Katakana
+_JP_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f]')
+
+# MeCab tagger shared by all Tokenizer instances (loading the dictionary
+# is the expensive part of creating one)
+_MECAB = None
+_MECAB_LOADED = False
+
+
+def _get_shared_mecab():
+    """Create the shared MeCab tagger on first use.
+    
+    Returns:
+        MeCab tagger, or None if MeCab is unavailable or failed to load
+    """
+    global _MECAB, _MECAB_LOADED
+    if not _MECAB_LOADED and MECAB_AVAILABLE:
+        try:
+            # -Owakati: Output only words separated by spaces
+            _MECAB = MeCab.Tagger("-Owakati")
+        except Exception as e:
+            print(f"Warning: MeCab initialization failed: {e}")
+            print("Falling back to basic tokenization")
+    _MECAB_LOADED = True
+    return _MECAB
+
 
 class Tokenizer:
     """Multi-language tokenizer with Japanese support via MeCab."""
     
+    # Number of recent results kept, and the longest text that is cached.
+    # Only query-sized texts are worth caching; pages and chunks are rarely
+    # tokenized twice and would pin a lot of memory.
+    CACHE_SIZE = 4096
+    CACHE_MAX_LENGTH = 256
+    
     def __init__(self):
         """Initialize tokenizer with MeCab if available."""
-        self.mecab = None
-        if MECAB_AVAILABLE:
-            try:
-                # -Owakati: Output only words separated by spaces
-                self.mecab = MeCab.Tagger("-Owakati")
-            except Exception as e:
-                print(f"Warning: MeCab initialization failed: {e}")
-                print("Falling back to basic tokenization")
+        self.mecab = _get_shared_mecab()
+        
+        # Recent results for short texts (LRU), so a query seen again (e.g.
+        # run in both keyword and semantic search) is not re-tokenized by
+        # MeCab. Guarded by a lock: the global tokenizer is shared by the UI
+        # and indexing threads.
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def parse(self, text: str) -> Tuple[str, List[str]]:
+        """Tokenize text once and return both output forms.
+        
+        Args:
+            text: Input text to tokenize
+            
+        Returns:
+            Tuple of (space-separated tokens, list of tokens)
+        """
+        tokenized = self._tokenize_cached(text)
+        return tokenized, tokenized.split()
+    
+    def _tokenize_cached(self, text: str) -> str:
+        """Tokenize text, using the cache for short texts."""
+        if not text:
+            return ""
+        
+        cacheable = len(text) <= self.CACHE_MAX_LENGTH
+        if cacheable:
+            with self._cache_lock:
+                tokenized = self._cache.get(text)
+                if tokenized is not None:
+                    self._cache.move_to_end(text)
+                    return tokenized
+        
+        # If text contains Japanese characters, use MeCab
+        if self._contains_japanese(text) and self.mecab:
+            tokenized = self._tokenize_japanese(text)
+        else:
+            # For non-Japanese text, return as-is (FTS5 handles it)
+            tokenized = text
+        
+        if cacheable:
+            with self._cache_lock:
+                self._cache[text] = tokenized
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return tokenized
+    
+    def cache_clear(self) -> None:
+        """Drop all cached results."""
+        with self._cache_lock:
+            self._cache.clear()
     
     def tokenize(self, text: str) -> str:
         """Tokenize text for FTS5 indexing.
@@ -37,15 +116,7 @@ class Tokenizer:
         Returns:
             Space-separated tokens suitable for FTS5
         """
-        if not text:
-            return ""
-        
-        # If text contains Japanese characters, use MeCab
-        if self._contains_japanese(text) and self.mecab:
-            return self._tokenize_japanese(text)
-        
-        # For non-Japanese text, return as-is (FTS5 handles it)
-        return text
+        return self._tokenize_cached(text)
     
     def _contains_japanese(self, text: str) -> bool:
         """Check if text contains Japanese characters.
@@ -56,10 +127,10 @@ class Tokenizer:
         Returns:
             True if text contains Hiragana, Katakana, or Kanji
         """
-        # Hiragana: \u3040-\u309f
-        # Katakana: \u30a0-\u30ff
-        # Kanji: \u4e00-\u9fff
-        return bool(re.search(r'[\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff]', text))
+        # str.isascii() reads a flag CPython already stores on the string
+        if text.isascii():
+            return False
+        return _JP_RE.search(text) is not None
     
     def _tokenize_japanese(self, text: str) -> str:
         """Tokenize Japanese text using MeCab.
@@ -89,8 +160,7 @@ class Tokenizer:
         Returns:
             List of tokens
         """
-        tokenized = self.tokenize(text)
-        return tokenized.split() if tokenized else []
+        return self._tokenize_cached(text).split()
 
 
 # Global tokenizer instance
@@ -1,10 +1,19 @@
 """Text chunking module with overlap and deduplication."""
 import hashlib
-from typing import List, Tuple
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
 from ..core.tokenizer import get_tokenizer
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 
 @dataclass
 class TextChunk:
@@ -17,9 +26,29 @@ class TextChunk:
     token_count: int
 
 
+# Chunker used by worker processes in Chunker.chunk_pages
+_worker_chunker: Optional['Chunker'] = None
+
+
+def _init_worker(chunk_size: int, chunk_overlap: int) -> None:
+    """Create the worker's chunker (and its MeCab tagger) once per process."""
+    global _worker_chunker
+    _worker_chunker = Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _chunk_page(page: Tuple[int, str]) -> List[TextChunk]:
+    """Chunk one page in a worker process."""
+    page_num, text = page
+    return _worker_chunker.chunk_text(text, page_number=page_num)
+
+
 class Chunker:
     """Handles text chunking with overlap."""
     
+    # Minimum pages before chunk_pages uses worker processes. Starting a
+    # pool and loading MeCab in each worker outweighs the gain below this.
+    PARALLEL_MIN_PAGES = 64
+    
     def __init__(self, chunk_size: int = 800, chunk_overlap: int = 150):
         """Initialize chunker.
         
@@ -100,15 +129,30 @@ class Chunker:
         
         return chunks
     
-    def chunk_pages(self, pages: List[Tuple[int, str]]) -> List[TextChunk]:
+    def chunk_pages(
+        self,
+        pages: List[Tuple[int, str]],
+        max_workers: Optional[int] = None
+    ) -> List[TextChunk]:
         """Chunk multiple pages while preserving page numbers.
         
+        Large documents (at least ``PARALLEL_MIN_PAGES`` pages) are chunked
+        across worker processes. Results keep the page order.
+        
         Args:
             pages: List of (page_number, text) tuples
+            max_workers: Number of worker processes (default: CPU count).
+                Use 1 to always chunk in this process.
             
         Returns:
             List of TextChunk objects from all pages
         """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        
+        if len(pages) >= self.PARALLEL_MIN_PAGES and max_workers > 1:
+            return self._chunk_pages_parallel(pages, max_workers)
+        
         all_chunks = []
         
         for page_num, text in pages:
@@ -117,6 +161,27 @@ class Chunker:
         
         return all_chunks
     
+    def _chunk_pages_parallel(
+        self,
+        pages: List[Tuple[int, str]],
+        max_workers: int
+    ) -> List[TextChunk]:
+        """Chunk pages in a process pool, preserving page order."""
+        all_chunks = []
+        
+        # Spawn rather than fork; the GUI process has Qt and torch threads
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.chunk_size, self.chunk_overlap)
+        ) as executor:
+            chunksize = max(1, len(pages) // (max_workers * 4))
+            for page_chunks in executor.map(_chunk_page, pages, chunksize=chunksize):
+                all_chunks.extend(page_chunks)
+        
+        return all_chunks
+    
     def deduplicate_chunks(self, chunks: List[TextChunk]) -> List[TextChunk]:
         """Remove duplicate chunks based on hash.
         
@@ -137,7 +202,10 @@ class Chunker:
         return unique_chunks
     
     def _generate_hash(self, text: str) -> str:
-        """Generate SHA256 hash of text.
+        """Generate a deduplication hash of text.
+        
+        Uses xxHash (XXH3, 64-bit) when installed, otherwise SHA256. The
+        hash only needs to detect duplicate chunks, not resist attacks.
         
         Args:
             text: Text to hash
@@ -145,4 +213,6 @@ class Chunker:
         Returns:
             Hex string of hash
         """
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_hexdigest(text.encode('utf-8'))
         return hashlib.sha256(text.encode('utf-8')).hexdigest()
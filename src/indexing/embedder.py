@@ -9,25 +9,46 @@ from pathlib import Path
 class Embedder:
     """Generate text embeddings using sentence-transformers.
     
-    Supports batch processing with progress tracking.
+    Supports batch processing with progress tracking. Embeddings are
+    L2-normalized, so cosine similarity is a plain dot product.
     """
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', cache_dir: Optional[Path] = None):
+    # Default batch sizes; a GPU needs larger batches to stay busy
+    CPU_BATCH_SIZE = 32
+    GPU_BATCH_SIZE = 256
+    
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        cache_dir: Optional[Path] = None,
+        fp16: bool = True
+    ):
         """Initialize embedder with specified model.
         
         Args:
             model_name: Name of sentence-transformers model
             cache_dir: Optional directory for model cache
+            fp16: Run the model in half precision when it is on a CUDA GPU
         """
         self.model_name = model_name
         self.cache_dir = str(cache_dir) if cache_dir else None
+        self.fp16 = fp16
         self._model: Optional[SentenceTransformer] = None
     
     @property
     def model(self) -> SentenceTransformer:
         """Lazy load the model."""
         if self._model is None:
-            self._model = SentenceTransformer(self.model_name, cache_folder=self.cache_dir)
+            # Fast (Rust) tokenizer; the Python one is much slower on CJK text
+            model = SentenceTransformer(
+                self.model_name,
+                cache_folder=self.cache_dir,
+                tokenizer_kwargs={"use_fast": True}
+            )
+            # sentence-transformers picks CUDA automatically when available
+            if self.fp16 and model.device.type == 'cuda':
+                model = model.half()
+            self._model = model
         return self._model
     
     @property
@@ -42,27 +63,34 @@ class Embedder:
             text: Input text
             
         Returns:
-            Embedding vector as numpy array
+            Unit-length embedding vector as numpy array
         """
-        return self.model.encode(text, convert_to_numpy=True)
+        embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        
+        # A half-precision GPU model may return float16
+        return embedding.astype(np.float32, copy=False)
     
     def embed_batch(
         self,
         texts: List[str],
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
         show_progress: bool = False,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        dtype: type = np.float32
     ) -> np.ndarray:
         """Generate embeddings for multiple texts.
         
         Args:
             texts: List of input texts
-            batch_size: Number of texts to process at once
+            batch_size: Number of texts to process at once (default:
+                CPU_BATCH_SIZE, or GPU_BATCH_SIZE when running on a GPU)
             show_progress: Whether to show progress bar
             progress_callback: Optional callback function(current, total)
+            dtype: Output dtype. np.float16 halves the memory of stored
+                embeddings; similarity_batch still computes in float32.
             
         Returns:
-            2D numpy array of embeddings (num_texts x dimension)
+            2D numpy array of unit-length embeddings (num_texts x dimension)
         """
         if not texts:
             return np.array([])
@@ -74,45 +102,46 @@ class Embedder:
         else:
             _callback = None
         
+        if batch_size is None:
+            on_gpu = self.model.device.type == 'cuda'
+            batch_size = self.GPU_BATCH_SIZE if on_gpu else self.CPU_BATCH_SIZE
+        
         embeddings = self.model.encode(
             texts,
             batch_size=batch_size,
             show_progress_bar=show_progress,
-            convert_to_numpy=True
+            convert_to_numpy=True,
+            normalize_embeddings=True
         )
         
         # Call progress callback at the end
         if progress_callback:
             progress_callback(len(texts), len(texts))
         
-        return embeddings
+        return embeddings.astype(dtype, copy=False)
     
     def similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """Calculate cosine similarity between two embeddings.
         
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First unit-length embedding vector
+            embedding2: Second unit-length embedding vector
             
         Returns:
             Cosine similarity score (0-1)
         """
-        # Normalize vectors
-        norm1 = np.linalg.norm(embedding1)
-        norm2 = np.linalg.norm(embedding2)
-        
-        if norm1 == 0 or norm2 == 0:
+        if not embedding1.any() or not embedding2.any():
             return 0.0
         
-        # Cosine similarity
-        return float(np.dot(embedding1, embedding2) / (norm1 * norm2))
+        # Unit vectors: cosine similarity is the dot product
+        return float(np.dot(embedding1, embedding2))
     
     def similarity_batch(self, query_embedding: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
         """Calculate cosine similarity between query and multiple embeddings.
         
         Args:
-            query_embedding: Query embedding vector (1D)
-            embeddings: Multiple embedding vectors (2D array)
+            query_embedding: Unit-length query embedding vector (1D)
+            embeddings: Unit-length embedding vectors (2D array)
             
         Returns:
             Array of similarity scores
@@ -120,15 +149,10 @@ class Embedder:
         if embeddings.ndim == 1:
             embeddings = embeddings.reshape(1, -1)
         
-        # Normalize query
-        query_norm = query_embedding / np.linalg.norm(query_embedding)
-        
-        # Normalize embeddings
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        norms[norms == 0] = 1  # Avoid division by zero
-        embeddings_norm = embeddings / norms
-        
-        # Compute similarities
-        similarities = np.dot(embeddings_norm, query_norm)
+        # float32 keeps the product on the single-precision BLAS path.
+        # Unit vectors: one matrix-vector product gives the cosines, and
+        # zero vectors score 0 without special handling.
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
         
-        return similarities
+        return embeddings @ query
@@ -1,11 +1,25 @@
 """Text extraction module for PDF, TXT, and MD files."""
 import fitz  # PyMuPDF
+import mmap
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from charset_normalizer import from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
 
-@dataclass
+# Encodings tried for text files, in order
+TEXT_ENCODINGS = ['utf-8', 'utf-8-sig', 'shift_jis', 'cp932', 'latin-1']
+
+
+@dataclass(frozen=True)
 class ExtractedPage:
     """Represents extracted text from a single page."""
     page_number: int
@@ -26,9 +40,33 @@ class ExtractedDocument:
         return '\n\n'.join(page.text for page in self.pages)
 
 
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Extract stripped text for pages [start, stop) in a worker process."""
+    with fitz.open(file_path) as doc:
+        return [(page_num + 1, doc[page_num].get_text().strip()) for page_num in range(start, stop)]
+
+
 class Extractor:
     """Handles text extraction from various file formats."""
     
+    # Minimum pages before a PDF is split across worker processes.
+    # PyMuPDF is not thread-safe, so each worker opens its own document.
+    PARALLEL_MIN_PAGES = 64
+    
+    def __init__(self, cache_size: int = 0, max_workers: Optional[int] = None):
+        """Initialize extractor.
+        
+        Args:
+            cache_size: Number of extracted documents to keep in memory
+                (default: 0, no caching). Entries are keyed on path, mtime
+                and size, so a changed file is extracted again.
+            max_workers: Worker processes for large PDFs (default: CPU
+                count). Use 1 to always extract in this process.
+        """
+        self.cache_size = cache_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cache: OrderedDict[tuple, ExtractedDocument] = OrderedDict()
+    
     def extract(self, file_path: str) -> ExtractedDocument:
         """Extract text from file based on extension.
         
@@ -47,8 +85,28 @@ class Extractor:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        ext = path.suffix.lower()
+        stat = path.stat()
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._extract_uncached(file_path, path.suffix.lower())
+            if self.cache_size > 0:
+                self._cache[key] = cached
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
         
+        # Pages are immutable; give each caller its own document and list
+        return ExtractedDocument(
+            file_path=file_path,
+            pages=list(cached.pages),
+            total_chars=cached.total_chars
+        )
+    
+    def _extract_uncached(self, file_path: str, ext: str) -> ExtractedDocument:
+        """Dispatch extraction on file extension."""
         if ext == '.pdf':
             return self.extract_pdf(file_path)
         elif ext == '.txt':
@@ -71,24 +129,28 @@ class Extractor:
             Exception: If PDF cannot be read
         """
         try:
-            doc = fitz.open(file_path)
-            pages = []
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                
-                # Clean up text
-                text = text.strip()
-                
-                if text:  # Only add non-empty pages
-                    pages.append(ExtractedPage(
-                        page_number=page_num + 1,  # 1-indexed
-                        text=text,
-                        char_count=len(text)
-                    ))
-            
-            doc.close()
+            with fitz.open(file_path) as doc:
+                page_count = len(doc)
+                page_texts = None
+                if page_count < self.PARALLEL_MIN_PAGES or self.max_workers <= 1:
+                    # 1-indexed page numbers, cleaned up text
+                    page_texts = [
+                        (page_num + 1, page.get_text().strip())
+                        for page_num, page in enumerate(doc)
+                    ]
+            
+            if page_texts is None:
+                page_texts = self._extract_pdf_parallel(file_path, page_count)
+            
+            pages = [
+                ExtractedPage(
+                    page_number=page_number,
+                    text=text,
+                    char_count=len(text)
+                )
+                for page_number, text in page_texts
+                if text  # Only add non-empty pages
+            ]
             
             total_chars = sum(p.char_count for p in pages)
             
@@ -101,6 +163,28 @@ class Extractor:
         except Exception as e:
             raise Exception(f"Failed to extract PDF {file_path}: {str(e)}") from e
     
+    def _extract_pdf_parallel(self, file_path: str, page_count: int) -> List[Tuple[int, str]]:
+        """Extract PDF pages in contiguous ranges across worker processes."""
+        workers = min(self.max_workers, page_count)
+        step = -(-page_count // workers)  # Ceiling division
+        starts = range(0, page_count, step)
+        
+        page_texts = []
+        # Spawn rather than fork; the GUI process has Qt and torch threads
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            for texts in executor.map(
+                _extract_page_range,
+                [file_path] * len(starts),
+                starts,
+                [min(start + step, page_count) for start in starts]
+            ):
+                page_texts.extend(texts)
+        
+        return page_texts
+    
     def extract_txt(self, file_path: str) -> ExtractedDocument:
         """Extract text from TXT file.
         
@@ -116,20 +200,14 @@ class Extractor:
             Exception: If file cannot be read
         """
         try:
-            # Try multiple encodings
-            encodings = ['utf-8', 'utf-8-sig', 'shift_jis', 'cp932', 'latin-1']
-            text = None
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        text = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if text is None:
-                raise Exception("Could not decode file with any supported encoding")
+            # Decode straight from a read-only mapping of the file, so the
+            # raw bytes are not copied into Python first
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    text = ''  # Empty files cannot be mapped
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        text = self._decode_text(mm)
             
             text = text.strip()
             
@@ -148,6 +226,40 @@ class Extractor:
         except Exception as e:
             raise Exception(f"Failed to extract TXT {file_path}: {str(e)}") from e
     
+    def _decode_text(self, data) -> str:
+        """Decode file contents.
+        
+        UTF-8 is tried first. If it fails and charset-normalizer is
+        installed, the encoding is detected once among the supported
+        encodings. Otherwise each supported encoding is tried in order.
+        
+        Args:
+            data: Bytes-like file contents
+            
+        Returns:
+            Decoded text
+            
+        Raises:
+            Exception: If no supported encoding can decode the data
+        """
+        try:
+            return str(data, 'utf-8')
+        except UnicodeDecodeError:
+            pass
+        
+        if CHARSET_NORMALIZER_AVAILABLE:
+            match = from_bytes(bytes(data), cp_isolation=TEXT_ENCODINGS).best()
+            if match is not None:
+                return str(match)
+        
+        for encoding in TEXT_ENCODINGS[1:]:
+            try:
+                return str(data, encoding)
+            except UnicodeDecodeError:
+                continue
+        
+        raise Exception("Could not decode file with any supported encoding")
+    
     def extract_md(self, file_path: str) -> ExtractedDocument:
         """Extract text from Markdown file.
         
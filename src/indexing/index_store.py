@@ -1,14 +1,82 @@
 """FAISS vector index management."""
 
 from typing import List, Optional, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+import math
 import numpy as np
 import faiss
 from pathlib import Path
+import json
+import os
 import pickle
+import struct
+import tempfile
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Mapping file layout: magic, then version and metadata length (two
+# little-endian uint32), JSON metadata, then the chunk IDs in FAISS id
+# order as UTF-8, each followed by a NUL byte. Decoding is one decode()
+# and one split() instead of unpickling an object per ID.
+MAP_MAGIC = b"FAISSMAP"
+MAP_VERSION = 1
+_MAP_HEADER = struct.Struct('<II')
+
+
+def _write_id_map(map_path: Path, chunk_ids: List[str], metadata: dict) -> None:
+    """Write chunk IDs and index metadata in the binary mapping format."""
+    if any('\0' in chunk_id for chunk_id in chunk_ids):
+        raise ValueError("Chunk IDs must not contain NUL characters")
+    
+    meta = json.dumps(dict(metadata, count=len(chunk_ids))).encode('utf-8')
+    ids = ''.join(chunk_id + '\0' for chunk_id in chunk_ids).encode('utf-8')
+    with open(map_path, 'wb') as f:
+        f.write(MAP_MAGIC)
+        f.write(_MAP_HEADER.pack(MAP_VERSION, len(meta)))
+        f.write(meta)
+        f.write(ids)
+
+
+def _replace_with(path: Path, write) -> None:
+    """Write a file under a temporary name, then move it over ``path``.
+    
+    The old file is never truncated, so a process that has it memory-mapped
+    keeps reading the old contents instead of crashing with SIGBUS.
+    
+    Args:
+        path: File to create or replace
+        write: Called with the temporary path to write to
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_id_map(data: bytes) -> Tuple[List[str], dict]:
+    """Parse a binary mapping file into (chunk IDs, metadata)."""
+    offset = len(MAP_MAGIC)
+    version, meta_len = _MAP_HEADER.unpack_from(data, offset)
+    if version != MAP_VERSION:
+        raise ValueError(f"Unsupported mapping file version: {version}")
+    
+    offset += _MAP_HEADER.size
+    metadata = json.loads(data[offset:offset + meta_len])
+    chunk_ids = data[offset + meta_len:].decode('utf-8').split('\0')[:-1]
+    if len(chunk_ids) != metadata['count']:
+        raise ValueError("Mapping file is truncated or corrupt")
+    return chunk_ids, metadata
+
+
+def gpu_available() -> bool:
+    """Check if FAISS was built with GPU support and a GPU is present."""
+    return hasattr(faiss, 'StandardGpuResources') and faiss.get_num_gpus() > 0
+
 
 class FAISSIndexStore:
     """Manage FAISS index for vector search.
@@ -17,25 +85,80 @@ class FAISSIndexStore:
     with mapping between FAISS IDs and chunk IDs.
     """
     
-    def __init__(self, dimension: int, index_type: str = 'Flat'):
+    # Corpus size above which IVF beats brute-force Flat search
+    IVF_THRESHOLD = 50_000
+    # Clusters probed per IVF query (recall vs. speed)
+    IVF_NPROBE = 16
+    # Vectors sampled from the first add to train an SQ8 quantizer
+    SQ_TRAIN_SAMPLE = 10_000
+    # Flat index size above which a few queries are split across threads
+    PARALLEL_SEARCH_MIN_VECTORS = 100_000
+    
+    def __init__(
+        self,
+        dimension: int,
+        index_type: str = 'Flat',
+        gpu: bool = False,
+        nlist: int = 100
+    ):
         """Initialize FAISS index store.
         
+        A GPU only pays off when queries are batched through ``search_batch``
+        on a large index. Single interactive queries are faster on the CPU,
+        so ``gpu`` should stay False for per-query search.
+        
         Args:
             dimension: Embedding vector dimension
-            index_type: Type of FAISS index ('Flat', 'HNSW', 'IVF')
+            index_type: Type of FAISS index ('Flat', 'HNSW', 'IVF', 'SQ8',
+                'SQfp16'). SQ8 and SQfp16 are exhaustive like Flat but store
+                8-bit codes or half floats: a quarter or half of the memory
+                (and memory bandwidth) for slightly less exact scores
+            gpu: Move the index to the first GPU if one is available
+            nlist: Number of IVF clusters (IVF only)
         """
         self.dimension = dimension
         self.index_type = index_type
+        self.gpu = gpu
+        self.nlist = nlist
+        self._gpu_resources = None
         self.index: Optional[faiss.Index] = None
-        self.chunk_id_map: Dict[int, str] = {}  # FAISS ID -> chunk ID
-        self.reverse_map: Dict[str, int] = {}   # chunk ID -> FAISS ID
+        # FAISS IDs are assigned consecutively from 0, so a list indexed by
+        # FAISS ID maps back to chunk IDs without a second dict. IVF keeps
+        # IDs stable across removals; removed IDs hold '' in the list.
+        self.chunk_id_map: List[str] = []       # FAISS ID -> chunk ID
+        self._reverse_map: Optional[Dict[str, int]] = {}  # see reverse_map
         self._next_id = 0
+        self._mmapped = False  # Index is a read-only memory map of its file
+    
+    @classmethod
+    def for_corpus_size(cls, dimension: int, num_vectors: int, **kwargs) -> 'FAISSIndexStore':
+        """Create an index store suited to the corpus size.
+        
+        Flat (exact) search is fastest for small corpora. Above
+        ``IVF_THRESHOLD`` vectors an IVF index with ``4 * sqrt(N)``
+        clusters is used instead.
+        
+        Args:
+            dimension: Embedding vector dimension
+            num_vectors: Number of vectors that will be indexed
+            **kwargs: Passed to the constructor
+            
+        Returns:
+            FAISSIndexStore instance
+        """
+        if num_vectors < cls.IVF_THRESHOLD:
+            return cls(dimension=dimension, index_type='Flat', **kwargs)
+        
+        nlist = 4 * int(math.sqrt(num_vectors))
+        return cls(dimension=dimension, index_type='IVF', nlist=nlist, **kwargs)
     
     def create_index(self) -> None:
         """Create a new FAISS index."""
         if self.index_type == 'Flat':
-            # Flat L2 index (exact search)
-            self.index = faiss.IndexFlatIP(self.dimension)  # Inner product (cosine sim)
+            # Exact inner-product search. Vectors are unit length, so
+            # ||q - x||^2 = 2 - 2<q, x>: the ranking matches L2 without the
+            # two norm terms, and the score is the cosine similarity.
+            self.index = faiss.IndexFlatIP(self.dimension)
         elif self.index_type == 'HNSW':
             # HNSW index (approximate, fast)
             self.index = faiss.IndexHNSWFlat(self.dimension, 32)  # 32 is M parameter
@@ -43,20 +166,69 @@ class FAISSIndexStore:
             self.index.hnsw.efSearch = 16
         elif self.index_type == 'IVF':
             # IVF index (approximate, memory efficient)
-            nlist = 100  # Number of clusters
-            quantizer = faiss.IndexFlatIP(self.dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist)
+            self.index = faiss.index_factory(
+                self.dimension,
+                f"IVF{self.nlist},Flat",
+                faiss.METRIC_INNER_PRODUCT
+            )
+            self.index.nprobe = self.IVF_NPROBE
+        elif self.index_type == 'SQ8':
+            # Flat scan over 8-bit scalar-quantized vectors
+            self.index = faiss.IndexScalarQuantizer(
+                self.dimension,
+                faiss.ScalarQuantizer.QT_8bit,
+                faiss.METRIC_INNER_PRODUCT
+            )
+        elif self.index_type == 'SQfp16':
+            # Flat scan over half-precision vectors (no training needed)
+            self.index = faiss.IndexScalarQuantizer(
+                self.dimension,
+                faiss.ScalarQuantizer.QT_fp16,
+                faiss.METRIC_INNER_PRODUCT
+            )
         else:
             raise ValueError(f"Unknown index type: {self.index_type}")
         
+        self._mmapped = False
+        self._to_gpu()
         logger.info(f"Created {self.index_type} index with dimension {self.dimension}")
     
-    def add(self, chunk_ids: List[str], embeddings: np.ndarray) -> None:
+    def reserve(self, n_total: int) -> None:
+        """Preallocate storage for ``n_total`` vectors before adding them.
+        
+        Index types that keep all vectors in one buffer (Flat, SQ8) then
+        grow in place instead of reallocating and copying on each ``add``.
+        Other index types ignore the hint.
+        
+        Args:
+            n_total: Total number of vectors the index is expected to hold
+        """
+        if self.index is None:
+            self.create_index()
+        
+        self._ensure_writable()
+        
+        codes = getattr(self.index, 'codes', None)
+        if codes is None:
+            return
+        
+        # FAISS does not expose std::vector::reserve; growing and shrinking
+        # the buffer back leaves the larger capacity allocated
+        current = codes.size()
+        needed = n_total * self.index.code_size
+        if needed > current:
+            codes.resize(needed)
+            codes.resize(current)
+    
+    def add(self, chunk_ids: List[str], embeddings: np.ndarray, copy: bool = True) -> None:
         """Add vectors to the index.
         
         Args:
             chunk_ids: List of chunk IDs
             embeddings: 2D numpy array of embeddings (num_chunks x dimension)
+            copy: Normalize a copy of ``embeddings``. With False, a writable
+                C-contiguous float32 array is normalized in place and passed
+                to FAISS as is, saving a copy of the whole batch.
         """
         if self.index is None:
             self.create_index()
@@ -64,29 +236,39 @@ class FAISSIndexStore:
         if len(chunk_ids) == 0:
             return
         
-        # Ensure embeddings are 2D
-        if embeddings.ndim == 1:
-            embeddings = embeddings.reshape(1, -1)
+        self._ensure_writable()
         
-        # Normalize vectors for cosine similarity (with IndexFlatIP)
-        if self.index_type == 'Flat' or self.index_type == 'HNSW':
-            faiss.normalize_L2(embeddings)
+        # Normalize vectors for cosine similarity (inner product indexes)
+        embeddings = self._normalized(embeddings, copy=copy)
         
         # Train index if needed (IVF requires training)
+        # FAISS samples large training sets down to 256 vectors per cluster
         if self.index_type == 'IVF' and not self.index.is_trained:
-            if len(embeddings) < 100:
-                logger.warning(f"Only {len(embeddings)} vectors for training IVF index, recommend at least 100")
+            if len(embeddings) < self.nlist:
+                logger.warning(f"Only {len(embeddings)} vectors for training IVF index, recommend at least {self.nlist}")
             self.index.train(embeddings)
+        elif self.index_type == 'SQ8' and not self.index.is_trained:
+            # Per-dimension value ranges only need a sample of the vectors
+            train = embeddings
+            if len(train) > self.SQ_TRAIN_SAMPLE:
+                rng = np.random.default_rng(0)
+                train = train[rng.choice(len(train), self.SQ_TRAIN_SAMPLE, replace=False)]
+            self.index.train(train)
         
         # Add to index
         start_id = self._next_id
-        self.index.add(embeddings)
+        if isinstance(self.index, faiss.IndexIVF):
+            # Explicit IDs: after a removal ntotal no longer equals the next
+            # free ID, which plain add() would assume
+            ids = np.arange(start_id, start_id + len(embeddings), dtype=np.int64)
+            self.index.add_with_ids(embeddings, ids)
+        else:
+            self.index.add(embeddings)
         
         # Update mappings
-        for i, chunk_id in enumerate(chunk_ids):
-            faiss_id = start_id + i
-            self.chunk_id_map[faiss_id] = chunk_id
-            self.reverse_map[chunk_id] = faiss_id
+        self.chunk_id_map.extend(chunk_ids)
+        if self._reverse_map is not None:
+            self._reverse_map.update(zip(chunk_ids, range(start_id, start_id + len(chunk_ids))))
         
         self._next_id += len(chunk_ids)
         
@@ -102,37 +284,133 @@ class FAISSIndexStore:
         Returns:
             List of (chunk_id, score) tuples sorted by relevance
         """
-        if self.index is None or self.index.ntotal == 0:
-            return []
+        # One code path for single and batched queries
+        return self.search_batch(np.atleast_2d(query_embedding)[:1], k=k)[0]
+    
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Search for similar vectors for several queries at once.
+        
+        All queries are sent to FAISS in a single ``index.search`` call, which
+        is much faster than calling ``search`` once per query.
         
-        # Reshape to 2D if needed
-        if query_embedding.ndim == 1:
-            query_embedding = query_embedding.reshape(1, -1)
+        Args:
+            query_embeddings: Query vectors (2D array, num_queries x dimension)
+            k: Number of results to return per query
+            
+        Returns:
+            One list of (chunk_id, score) tuples per query, sorted by relevance
+        """
+        if query_embeddings.ndim == 1:
+            query_embeddings = query_embeddings.reshape(1, -1)
+        
+        if self.index is None or self.index.ntotal == 0:
+            return [[] for _ in range(len(query_embeddings))]
         
         # Normalize for cosine similarity
-        if self.index_type == 'Flat' or self.index_type == 'HNSW':
-            faiss.normalize_L2(query_embedding)
+        queries = self._normalized(query_embeddings)
         
-        # Search
+        # Search all queries at once
         k = min(k, self.index.ntotal)
-        scores, indices = self.index.search(query_embedding, k)
+        scores, indices = self._search_index(queries, k)
+        
+        # Convert to chunk IDs (tolist() converts all numpy scalars at once)
+        chunk_id_map = self.chunk_id_map
+        batch_results = []
+        for row_scores, row_indices in zip(scores.tolist(), indices.tolist()):
+            batch_results.append([
+                (chunk_id_map[faiss_id], score)
+                for faiss_id, score in zip(row_indices, row_scores)
+                # FAISS pads missing results with -1
+                if 0 <= faiss_id < len(chunk_id_map)
+            ])
+        
+        return batch_results
+    
+    @staticmethod
+    def _normalized(vectors: np.ndarray, copy: bool = True) -> np.ndarray:
+        """Return L2-normalized vectors as a 2D float32 array.
+        
+        ``faiss.normalize_L2`` normalizes the whole matrix in one native
+        call, in place, so by default it runs on a copy to leave the
+        caller's array untouched. With ``copy=False`` an array that is
+        already writable, C-contiguous float32 is normalized in place.
+        """
+        if copy:
+            vectors = np.array(vectors, dtype=np.float32, order='C', ndmin=2)
+        else:
+            # Returns the same memory when no conversion is needed
+            vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+            if not vectors.flags.writeable:
+                vectors = vectors.copy()
+        faiss.normalize_L2(vectors)
+        return vectors
+    
+    def _search_index(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Run a k-NN search on the index.
         
-        # Convert to chunk IDs
-        results = []
-        for i in range(len(indices[0])):
-            faiss_id = int(indices[0][i])
-            score = float(scores[0][i])
-            
-            if faiss_id in self.chunk_id_map:
-                chunk_id = self.chunk_id_map[faiss_id]
-                results.append((chunk_id, score))
+        FAISS parallelizes Flat search over queries, so a single query
+        scans the whole index on one core. For a large Flat index and
+        fewer queries than threads, the stored vectors are split into one
+        contiguous slab per thread instead, each slab is searched in
+        parallel, and the per-slab top-k lists are merged.
         
-        return results
+        Args:
+            queries: Normalized query vectors (2D float32 array)
+            k: Number of results per query (at most ``index.ntotal``)
+            
+        Returns:
+            (scores, indices) arrays of shape (num_queries, k)
+        """
+        num_threads = faiss.omp_get_max_threads()
+        ntotal = self.index.ntotal
+        if (
+            not isinstance(self.index, faiss.IndexFlat)
+            or self._gpu_resources is not None
+            or ntotal < self.PARALLEL_SEARCH_MIN_VECTORS
+            or num_threads < 2
+            or len(queries) >= num_threads
+        ):
+            return self.index.search(queries, k)
+        
+        # Zero-copy view of the stored vectors
+        vectors = faiss.rev_swig_ptr(
+            self.index.get_xb(), ntotal * self.dimension
+        ).reshape(ntotal, self.dimension)
+        
+        num_slabs = min(num_threads, ntotal)
+        bounds = np.linspace(0, ntotal, num_slabs + 1, dtype=np.int64)
+        slabs = [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+        
+        def search_slab(slab):
+            start, stop = slab
+            scores, indices = faiss.knn(
+                queries,
+                vectors[start:stop],
+                min(k, stop - start),
+                metric=faiss.METRIC_INNER_PRODUCT
+            )
+            return scores, indices + start
+        
+        with ThreadPoolExecutor(max_workers=num_slabs) as executor:
+            parts = list(executor.map(search_slab, slabs))
+        
+        # Merge the per-slab top-k lists (stable, so ties keep id order)
+        scores = np.concatenate([part[0] for part in parts], axis=1)
+        indices = np.concatenate([part[1] for part in parts], axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        return (
+            np.take_along_axis(scores, order, axis=1),
+            np.take_along_axis(indices, order, axis=1)
+        )
     
     def remove(self, chunk_ids: List[str]) -> None:
         """Remove vectors from the index.
         
-        Note: FAISS doesn't support efficient removal. This rebuilds the index.
+        Flat and SQ8 indexes drop the vectors in one ``remove_ids`` pass,
+        which compacts the remaining vectors in order. IVF indexes store
+        explicit IDs in their inverted lists (as ``IndexIDMap2`` would), so
+        vectors are removed in place and the other IDs stay unchanged.
+        HNSW indexes are rebuilt from the remaining vectors.
         
         Args:
             chunk_ids: List of chunk IDs to remove
@@ -140,20 +418,58 @@ class FAISSIndexStore:
         if self.index is None:
             return
         
-        # Get all vectors except the ones to remove
+        # Get all vectors except the ones to remove (set lookups, not a
+        # scan of chunk_ids per vector)
+        remove_set = set(chunk_ids)
         keep_ids = []
         keep_faiss_ids = []
-        
-        for faiss_id, chunk_id in self.chunk_id_map.items():
-            if chunk_id not in chunk_ids:
+        remove_faiss_ids = []
+        
+        for faiss_id, chunk_id in enumerate(self.chunk_id_map):
+            if not chunk_id:
+                continue  # Already removed (IVF)
+            if chunk_id in remove_set:
+                remove_faiss_ids.append(faiss_id)
+            else:
                 keep_ids.append(chunk_id)
                 keep_faiss_ids.append(faiss_id)
         
-        if len(keep_ids) == len(self.chunk_id_map):
+        if not remove_faiss_ids:
             # Nothing to remove
             return
         
-        # Rebuild index (FAISS limitation)
+        if isinstance(self.index, faiss.IndexFlatCodes) and self._gpu_resources is None:
+            self._ensure_writable()
+            
+            remove_ids = np.array(remove_faiss_ids, dtype=np.int64)
+            self.index.remove_ids(
+                faiss.IDSelectorBatch(len(remove_ids), faiss.swig_ptr(remove_ids))
+            )
+            
+            # Remaining vectors keep their order, so FAISS IDs are
+            # consecutive again
+            self.chunk_id_map = keep_ids
+            self._reverse_map = None
+            self._next_id = len(keep_ids)
+            logger.info(f"Removed {len(remove_ids)} vectors from index")
+            return
+        
+        if isinstance(self.index, faiss.IndexIVF) and self._gpu_resources is None:
+            self._ensure_writable()
+            
+            remove_ids = np.array(remove_faiss_ids, dtype=np.int64)
+            self.index.remove_ids(
+                faiss.IDSelectorBatch(len(remove_ids), faiss.swig_ptr(remove_ids))
+            )
+            
+            # Other IDs are unchanged; leave holes for the removed ones
+            for faiss_id in remove_faiss_ids:
+                self.chunk_id_map[faiss_id] = ''
+            self._reverse_map = None
+            logger.info(f"Removed {len(remove_ids)} vectors from index")
+            return
+        
+        # Rebuild index (no in-place removal for this index type)
         logger.info(f"Rebuilding index after removing {len(chunk_ids)} vectors")
         
         # Get vectors to keep
@@ -164,8 +480,8 @@ class FAISSIndexStore:
         
         # Reset and rebuild
         self.create_index()
-        self.chunk_id_map.clear()
-        self.reverse_map.clear()
+        self.chunk_id_map = []
+        self._reverse_map = {}
         self._next_id = 0
         
         if keep_embeddings:
@@ -183,29 +499,40 @@ class FAISSIndexStore:
             logger.warning("No index to save")
             return
         
-        # Save FAISS index
-        faiss.write_index(self.index, str(index_path))
-        
-        # Save mappings
-        mappings = {
-            'chunk_id_map': self.chunk_id_map,
-            'reverse_map': self.reverse_map,
-            'next_id': self._next_id,
+        # Save FAISS index (GPU indexes are copied back to CPU first)
+        index = self.index
+        if self._gpu_resources is not None:
+            index = faiss.index_gpu_to_cpu(index)
+        # Written to a temporary file and renamed over the old one, since
+        # another store may have the old file memory-mapped
+        _replace_with(index_path, lambda tmp: faiss.write_index(index, tmp))
+        
+        # Save mappings. FAISS ids are assigned consecutively from 0 (and
+        # compacted again by remove), so the chunk IDs in id order are
+        # enough to rebuild both maps.
+        metadata = {
             'dimension': self.dimension,
-            'index_type': self.index_type
+            'index_type': self.index_type,
+            'nlist': self.nlist
         }
-        
-        with open(map_path, 'wb') as f:
-            pickle.dump(mappings, f)
+        _replace_with(map_path, lambda tmp: _write_id_map(tmp, self.chunk_id_map, metadata))
         
         logger.info(f"Saved index ({self.index.ntotal} vectors) to {index_path}")
     
-    def load(self, index_path: Path, map_path: Path) -> None:
+    def load(self, index_path: Path, map_path: Path, mmap: bool = False) -> None:
         """Load index and mappings from disk.
         
+        With ``mmap=True`` the index file is memory-mapped read-only instead of
+        read into RAM, so pages are loaded on demand. The index is copied into
+        memory the first time it is modified. ``save`` replaces files rather
+        than overwriting them, so saving over a mapped file is safe: the
+        mapping keeps the old index until it is loaded again. (On Windows a
+        mapped file cannot be replaced at all.)
+        
         Args:
             index_path: Path to FAISS index file
             map_path: Path to ID mappings file
+            mmap: Memory-map the index file instead of reading it
         """
         if not index_path.exists():
             logger.warning(f"Index file not found: {index_path}")
@@ -218,28 +545,95 @@ class FAISSIndexStore:
             return
         
         # Load FAISS index
-        self.index = faiss.read_index(str(index_path))
+        self._mmapped = False
+        if mmap:
+            try:
+                # IO_FLAG_MMAP only maps IVF inverted lists; the _IFC variant
+                # also maps the codes of Flat, SQ and HNSW indexes
+                self.index = faiss.read_index(
+                    str(index_path),
+                    faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+                )
+                self._mmapped = True
+            except RuntimeError as e:
+                logger.warning(f"Could not memory-map index, reading it instead: {e}")
+        if not self._mmapped:
+            self.index = faiss.read_index(str(index_path))
+        self._gpu_resources = None
         
         # Load mappings
-        with open(map_path, 'rb') as f:
-            mappings = pickle.load(f)
-        
-        self.chunk_id_map = mappings['chunk_id_map']
-        self.reverse_map = mappings['reverse_map']
-        self._next_id = mappings['next_id']
+        data = map_path.read_bytes()
+        if data.startswith(MAP_MAGIC):
+            self.chunk_id_map, mappings = _read_id_map(data)
+        else:
+            # Pickled mapping files from older versions
+            mappings = pickle.loads(data)
+            if 'chunk_ids' in mappings:
+                self.chunk_id_map = list(mappings['chunk_ids'])
+            else:
+                id_map = mappings['chunk_id_map']
+                self.chunk_id_map = [id_map[i] for i in range(mappings['next_id'])]
+        
+        # Built on first use; searching only needs chunk_id_map
+        self._reverse_map = None
+        self._next_id = len(self.chunk_id_map)
         self.dimension = mappings['dimension']
         self.index_type = mappings['index_type']
+        self.nlist = mappings.get('nlist', self.nlist)
+        
+        self._to_gpu()
         
         logger.info(f"Loaded index ({self.index.ntotal} vectors) from {index_path}")
     
+    def _to_gpu(self) -> None:
+        """Move the index to the GPU if requested and available."""
+        if not self.gpu or self.index is None:
+            return
+        
+        if not gpu_available():
+            logger.info("No GPU available, keeping FAISS index on CPU")
+            return
+        
+        try:
+            self._gpu_resources = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self.index)
+            self._mmapped = False  # GPU copy is not backed by the file
+            logger.info("Moved FAISS index to GPU")
+        except RuntimeError as e:
+            # Not every index type has a GPU implementation (e.g. HNSW)
+            self._gpu_resources = None
+            logger.warning(f"Could not move index to GPU, using CPU: {e}")
+    
+    def _ensure_writable(self) -> None:
+        """Copy a memory-mapped index into RAM before modifying it.
+        
+        The mapped index is serialized and read back: clone_index would still
+        point at the mapping, and the file on disk may since have been
+        replaced by a newer index.
+        """
+        if self._mmapped and self.index is not None:
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self._mmapped = False
+    
     def clear(self) -> None:
         """Clear the index and all mappings."""
         self.index = None
-        self.chunk_id_map.clear()
-        self.reverse_map.clear()
+        self._gpu_resources = None
+        self._mmapped = False
+        self.chunk_id_map = []
+        self._reverse_map = {}
         self._next_id = 0
         logger.info("Cleared index")
     
+    @property
+    def reverse_map(self) -> Dict[str, int]:
+        """Chunk ID -> FAISS ID, built from ``chunk_id_map`` on first use."""
+        if self._reverse_map is None:
+            self._reverse_map = {
+                chunk_id: i for i, chunk_id in enumerate(self.chunk_id_map) if chunk_id
+            }
+        return self._reverse_map
+    
     @property
     def size(self) -> int:
         """Get number of vectors in the index."""
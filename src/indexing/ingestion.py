@@ -24,6 +24,8 @@ class Ingestion:
         self.allowed_extensions = allowed_extensions or ['.pdf', '.txt', '.md']
         # Normalize extensions to lowercase
         self.allowed_extensions = [ext.lower() for ext in self.allowed_extensions]
+        # Set for one hash probe per file instead of a list scan
+        self._ext_set = frozenset(self.allowed_extensions)
     
     def scan_folder(self, folder_path: str, recursive: bool = True) -> List[str]:
         """Scan folder for files matching allowed extensions.
@@ -47,23 +49,39 @@ class Ingestion:
         if not folder.is_dir():
             raise NotADirectoryError(f"Not a directory: {folder_path}")
         
-        files = []
-        
         try:
-            if recursive:
-                # Recursively find all files
-                for file_path in folder.rglob('*'):
-                    if file_path.is_file() and self._is_allowed_file(file_path):
-                        files.append(str(file_path.absolute()))
-            else:
-                # Only scan immediate directory
-                for file_path in folder.glob('*'):
-                    if file_path.is_file() and self._is_allowed_file(file_path):
-                        files.append(str(file_path.absolute()))
+            return list(self._iter_files(os.path.abspath(folder), recursive))
         except PermissionError as e:
             raise PermissionError(f"Cannot access folder: {folder_path}") from e
+    
+    def _iter_files(self, root: str, recursive: bool):
+        """Yield paths of allowed files under root using os.scandir.
+        
+        DirEntry type checks use the file type returned by the directory
+        read, so most entries need no extra stat call. Symlinked
+        directories are not followed; unreadable subdirectories are skipped.
         
-        return files
+        Args:
+            root: Absolute folder path to scan
+            recursive: Whether to descend into subdirectories
+            
+        Yields:
+            Absolute file paths
+        """
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                pending.append(entry.path)
+                        elif entry.is_file() and self._is_allowed_name(entry.name):
+                            yield entry.path
+            except PermissionError:
+                if directory == root:
+                    raise
     
     def _is_allowed_file(self, file_path: Path) -> bool:
         """Check if file extension is allowed.
@@ -74,7 +92,18 @@ class Ingestion:
         Returns:
             True if file should be processed
         """
-        return file_path.suffix.lower() in self.allowed_extensions
+        return file_path.suffix.lower() in self._ext_set
+    
+    def _is_allowed_name(self, name: str) -> bool:
+        """Check if a file name has an allowed extension.
+        
+        Args:
+            name: File name without directory
+            
+        Returns:
+            True if file should be processed
+        """
+        return os.path.splitext(name)[1].lower() in self._ext_set
     
     def add_files_to_db(self, file_paths: List[str]) -> tuple[int, int, List[str]]:
         """Add files to database as documents with PENDING status.
@@ -90,9 +119,9 @@ class Ingestion:
         if self.db is None:
             raise ValueError("Database is required for add_files_to_db()")
         
-        added = 0
         updated = 0
         errors = []
+        new_docs = []
         
         for file_path in file_paths:
             try:
@@ -131,12 +160,25 @@ class Ingestion:
                         status=DocumentStatus.PENDING,
                         error_message=None
                     )
-                    self.db.add_document(doc)
-                    added += 1
+                    new_docs.append(doc)
                     
             except Exception as e:
                 errors.append(f"{file_path}: {str(e)}")
         
+        # Insert new documents in one transaction
+        try:
+            self.db.add_documents(new_docs)
+            added = len(new_docs)
+        except Exception:
+            # The batch was rolled back; add one by one to report the failures
+            added = 0
+            for doc in new_docs:
+                try:
+                    self.db.add_document(doc)
+                    added += 1
+                except Exception as e:
+                    errors.append(f"{doc.path}: {str(e)}")
+        
         return added, updated, errors
     
     def get_pending_documents(self) -> List[Document]:
@@ -0,0 +1,100 @@
+"""Parallel extraction and chunking of whole documents."""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from ..core.models import Document
+from .chunker import Chunker, TextChunk
+from .extractor import Extractor
+
+# Extractor and chunker used by worker processes in extract_and_chunk
+_worker_extractor: Optional[Extractor] = None
+_worker_chunker: Optional[Chunker] = None
+
+
+def _init_worker(chunk_size: int, chunk_overlap: int) -> None:
+    """Create the worker's extractor and chunker once per process."""
+    global _worker_extractor, _worker_chunker
+    # Documents are already spread over processes, so no nested pools
+    _worker_extractor = Extractor(max_workers=1)
+    _worker_chunker = Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _extract_and_chunk(path: str) -> List[TextChunk]:
+    """Extract and chunk one document in a worker process."""
+    return _chunk_document(_worker_extractor, _worker_chunker, path, max_workers=1)
+
+
+def _chunk_document(
+    extractor: Extractor,
+    chunker: Chunker,
+    path: str,
+    max_workers: Optional[int] = None
+) -> List[TextChunk]:
+    """Extract a document's pages and split them into chunks."""
+    extracted = extractor.extract(path)
+    pages = [(page.page_number, page.text) for page in extracted.pages]
+    return chunker.chunk_pages(pages, max_workers=max_workers)
+
+
+def extract_and_chunk(
+    documents: Sequence[Document],
+    chunk_size: int = 800,
+    chunk_overlap: int = 150,
+    max_workers: Optional[int] = None
+) -> Iterator[Tuple[Document, Optional[List[TextChunk]], Optional[Exception]]]:
+    """Extract and chunk documents, several at a time in worker processes.
+    
+    PDF parsing and tokenization are CPU-bound and documents are
+    independent, so each document is handled by its own worker process.
+    Results are yielded as documents finish, so the caller can write each
+    one to the database (which stays in the calling process) while the
+    rest are still being processed.
+    
+    With a single document or worker the work runs in this process, where
+    a large PDF can still use page-level parallelism.
+    
+    Args:
+        documents: Documents to process
+        chunk_size: Target size of each chunk in tokens
+        chunk_overlap: Number of overlapping tokens between chunks
+        max_workers: Number of worker processes (default: CPU count)
+        
+    Yields:
+        (document, chunks, error) tuples in completion order. ``chunks`` is
+        None when processing the document raised ``error``.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(documents))
+    
+    if max_workers <= 1:
+        extractor = Extractor()
+        chunker = Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        for doc in documents:
+            try:
+                yield doc, _chunk_document(extractor, chunker, doc.path), None
+            except Exception as e:
+                yield doc, None, e
+        return
+    
+    # Spawn rather than fork: callers run on a QThread alongside Qt, torch
+    # and FAISS threads, whose locks a forked child would inherit
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(chunk_size, chunk_overlap)
+    )
+    try:
+        futures = {executor.submit(_extract_and_chunk, doc.path): doc for doc in documents}
+        for future in as_completed(futures):
+            doc = futures[future]
+            try:
+                yield doc, future.result(), None
+            except Exception as e:
+                yield doc, None, e
+    finally:
+        # Drop queued documents if the caller stops early (e.g. cancel)
+        executor.shutdown(wait=True, cancel_futures=True)
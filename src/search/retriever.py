@@ -1,7 +1,9 @@
 """Search retrieval with keyword, semantic, and hybrid modes."""
 
-from typing import List, Tuple, Optional, Dict
+from collections import OrderedDict
+from typing import List, Tuple, Optional, Dict, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 import numpy as np
 import logging
 
@@ -10,9 +12,128 @@ from ..core.models import Chunk
 from ..indexing.embedder import Embedder
 from ..indexing.index_store import FAISSIndexStore
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _query_words(query: str) -> Tuple[str, ...]:
+    """Lowercase words of a query, cached for repeated snippet formatting."""
+    return tuple(query.lower().split())
+
+
+# Score ranges below this count as all-equal scores in min-max scaling
+_MIN_SCORE_RANGE = 1e-12
+
+
+def _min_max_normalize(scores: Sequence[float]) -> np.ndarray:
+    """Scale scores to the 0-1 range in one vectorized pass.
+    
+    A single score, or scores that are all equal, normalize to 1.0.
+    """
+    arr = np.asarray(scores, dtype=np.float64)
+    if arr.size == 0:
+        return arr
+    mn = arr.min()
+    rng = arr.max() - mn
+    if rng < _MIN_SCORE_RANGE:
+        return np.ones_like(arr)
+    return (arr - mn) / rng
+
+
+def _top_k_order(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, ties in index order.
+    
+    Same result as ``np.argsort(-scores, kind='mergesort')[:k]``, but only
+    the k selected scores are sorted: one linear-time partition finds the
+    k-th largest score first.
+    """
+    n = scores.shape[0]
+    if k >= n:
+        return np.argsort(-scores, kind='mergesort')
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    
+    threshold = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > threshold)
+    # Equal scores at the cut keep the earliest indices, as a stable sort would
+    ties = np.flatnonzero(scores == threshold)[:k - above.shape[0]]
+    selected = np.sort(np.concatenate((above, ties)))
+    return selected[np.argsort(-scores[selected], kind='mergesort')]
+
+
+def _fuse_scores_numpy(
+    kw_ids: np.ndarray,
+    kw_scores: np.ndarray,
+    sem_ids: np.ndarray,
+    sem_scores: np.ndarray,
+    num_ids: int,
+    kw_weight: float,
+    sem_weight: float,
+    limit: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Weighted-sum score fusion over dense integer ids (NumPy version).
+    
+    Keyword and semantic scores are raw; each list is min-max normalized
+    (see _min_max_normalize) before weighting. Returns the fused score of
+    every id and the ids of the ``limit`` best, highest first.
+    """
+    fused = np.zeros(num_ids)
+    fused[kw_ids] = kw_weight * _min_max_normalize(kw_scores)
+    fused[sem_ids] += sem_weight * _min_max_normalize(sem_scores)
+    
+    # Ties keep first-seen order
+    return fused, _top_k_order(fused, limit)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _min_and_range(scores):
+        """Minimum and max - min of scores in one pass (JIT-compiled)."""
+        if scores.shape[0] == 0:
+            return 0.0, 0.0
+        mn = scores[0]
+        mx = scores[0]
+        for i in range(1, scores.shape[0]):
+            if scores[i] < mn:
+                mn = scores[i]
+            elif scores[i] > mx:
+                mx = scores[i]
+        return mn, mx - mn
+    
+    @njit(cache=True)
+    def _fuse_scores(kw_ids, kw_scores, sem_ids, sem_scores, num_ids, kw_weight, sem_weight, limit):
+        """Normalize and fuse scores over dense integer ids (JIT-compiled).
+        
+        Each score is read once more after its min/max pass: normalized,
+        weighted and added in the same loop.
+        """
+        fused = np.zeros(num_ids)
+        kw_min, kw_range = _min_and_range(kw_scores)
+        for i in range(kw_ids.shape[0]):
+            if kw_range < _MIN_SCORE_RANGE:
+                fused[kw_ids[i]] = kw_weight
+            else:
+                fused[kw_ids[i]] = kw_weight * ((kw_scores[i] - kw_min) / kw_range)
+        sem_min, sem_range = _min_and_range(sem_scores)
+        for i in range(sem_ids.shape[0]):
+            if sem_range < _MIN_SCORE_RANGE:
+                fused[sem_ids[i]] += sem_weight
+            else:
+                fused[sem_ids[i]] += sem_weight * ((sem_scores[i] - sem_min) / sem_range)
+        
+        # Compiled sort of a few dozen candidates; no need to partition
+        order = np.argsort(-fused, kind='mergesort')
+        return fused, order[:limit]
+else:
+    _fuse_scores = _fuse_scores_numpy
+
+
 @dataclass
 class SearchResult:
     """Search result with chunk and score."""
@@ -24,11 +145,15 @@ class SearchResult:
 class Retriever:
     """Retrieve relevant chunks using keyword, semantic, or hybrid search."""
     
+    # Number of recent query embeddings kept
+    QUERY_CACHE_SIZE = 256
+    
     def __init__(
         self,
         db: Database,
         embedder: Optional[Embedder] = None,
-        index_store: Optional[FAISSIndexStore] = None
+        index_store: Optional[FAISSIndexStore] = None,
+        cache_queries: bool = True
     ):
         """Initialize retriever.
         
@@ -36,10 +161,15 @@ class Retriever:
             db: Database manager
             embedder: Text embedder (required for semantic/hybrid search)
             index_store: FAISS index store (required for semantic/hybrid search)
+            cache_queries: Reuse embeddings of recently searched queries
         """
         self.db = db
         self.embedder = embedder
         self.index_store = index_store
+        self.cache_queries = cache_queries
+        
+        # Recent query embeddings (LRU), so repeating a search skips the model
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
     
     def keyword_search(self, query: str, limit: int = 10) -> List[SearchResult]:
         """Search using FTS5 keyword matching.
@@ -91,7 +221,7 @@ class Retriever:
             return []
         
         # Generate query embedding
-        query_embedding = self.embedder.embed(query)
+        query_embedding = self._embed_queries([query])[0]
         
         # Search FAISS index
         results = self.index_store.search(query_embedding, k=limit)
@@ -109,6 +239,86 @@ class Retriever:
         
         return search_results
     
+    def semantic_search_batch(self, queries: List[str], limit: int = 10) -> List[List[SearchResult]]:
+        """Search several queries using semantic similarity.
+        
+        Queries are embedded with one batched forward pass and searched with
+        one FAISS call, instead of one round trip per query.
+        
+        Args:
+            queries: Search queries
+            limit: Maximum number of results per query
+            
+        Returns:
+            One list of search results per query, sorted by similarity
+        """
+        if self.embedder is None:
+            raise ValueError("Embedder is required for semantic search")
+        
+        batch_results: List[List[SearchResult]] = [[] for _ in queries]
+        
+        if self.index_store is None or self.index_store.size == 0:
+            logger.warning("FAISS index is empty")
+            return batch_results
+        
+        # Empty queries get empty results, same as semantic_search
+        positions = [i for i, query in enumerate(queries) if query.strip()]
+        if not positions:
+            return batch_results
+        
+        # Embed and search all non-empty queries at once
+        query_embeddings = self._embed_queries([queries[i] for i in positions])
+        results = self.index_store.search_batch(query_embeddings, k=limit)
+        
+        # Get chunks and create results
+        for position, query_results in zip(positions, results):
+            search_results = []
+            for rank, (chunk_id, score) in enumerate(query_results, 1):
+                chunk = self.db.get_chunk(chunk_id)
+                if chunk:
+                    search_results.append(SearchResult(
+                        chunk=chunk,
+                        score=score,
+                        rank=rank
+                    ))
+            batch_results[position] = search_results
+        
+        return batch_results
+    
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed queries, reusing cached embeddings of repeated queries.
+        
+        Args:
+            queries: Non-empty search queries
+            
+        Returns:
+            2D array of query embeddings, one row per query
+        """
+        if not self.cache_queries:
+            return self.embedder.embed_batch(queries)
+        
+        # Embed each distinct uncached query once, in one batch
+        missing = [q for q in dict.fromkeys(queries) if q not in self._query_cache]
+        if missing:
+            for query, embedding in zip(missing, self.embedder.embed_batch(missing)):
+                # Shared between searches, so callers must not modify it
+                embedding.flags.writeable = False
+                self._query_cache[query] = embedding
+        
+        embeddings = []
+        for query in queries:
+            self._query_cache.move_to_end(query)
+            embeddings.append(self._query_cache[query])
+        
+        while len(self._query_cache) > self.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        
+        return np.stack(embeddings)
+    
+    def clear_query_cache(self) -> None:
+        """Drop all cached query embeddings."""
+        self._query_cache.clear()
+    
     def hybrid_search(
         self,
         query: str,
@@ -143,72 +353,59 @@ class Retriever:
         if not keyword_results and not semantic_results:
             return []
         
-        # Normalize scores using min-max normalization
-        keyword_scores = self._normalize_scores([r.score for r in keyword_results])
-        semantic_scores = self._normalize_scores([r.score for r in semantic_results])
-        
-        # Create score maps
-        chunk_scores: Dict[str, float] = {}
-        chunk_map: Dict[str, Chunk] = {}
-        
-        # Add keyword scores
-        for i, result in enumerate(keyword_results):
-            chunk_id = result.chunk.id
-            chunk_scores[chunk_id] = keyword_weight * keyword_scores[i]
-            chunk_map[chunk_id] = result.chunk
-        
-        # Add semantic scores
-        for i, result in enumerate(semantic_results):
-            chunk_id = result.chunk.id
-            if chunk_id in chunk_scores:
-                # Combine scores if chunk appears in both
-                chunk_scores[chunk_id] += semantic_weight * semantic_scores[i]
-            else:
-                chunk_scores[chunk_id] = semantic_weight * semantic_scores[i]
-            chunk_map[chunk_id] = result.chunk
-        
-        # Sort by combined score
-        sorted_chunks = sorted(
-            chunk_scores.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:limit]
+        keyword_scores = np.array([r.score for r in keyword_results], dtype=np.float64)
+        semantic_scores = np.array([r.score for r in semantic_results], dtype=np.float64)
+        
+        # Map chunk IDs to dense integer ids in first-seen order, in one pass
+        positions: Dict[str, int] = {}
+        chunks: List[Chunk] = []
+        
+        def dense_ids(results: List[SearchResult]) -> np.ndarray:
+            ids = np.empty(len(results), dtype=np.int64)
+            for i, result in enumerate(results):
+                position = positions.get(result.chunk.id)
+                if position is None:
+                    position = positions[result.chunk.id] = len(chunks)
+                    chunks.append(result.chunk)
+                ids[i] = position
+            return ids
+        
+        kw_ids = dense_ids(keyword_results)
+        sem_ids = dense_ids(semantic_results)
+        
+        # Min-max normalize, combine and rank the top results in one call
+        fused, order = _fuse_scores(
+            kw_ids,
+            keyword_scores,
+            sem_ids,
+            semantic_scores,
+            len(chunks),
+            float(keyword_weight),
+            float(semantic_weight),
+            limit
+        )
         
         # Create final results
         search_results = []
-        for rank, (chunk_id, score) in enumerate(sorted_chunks, 1):
+        for rank, i in enumerate(order, 1):
             search_results.append(SearchResult(
-                chunk=chunk_map[chunk_id],
-                score=score,
+                chunk=chunks[i],
+                score=float(fused[i]),
                 rank=rank
             ))
         
         return search_results
     
-    def _normalize_scores(self, scores: List[float]) -> List[float]:
+    def _normalize_scores(self, scores: Sequence[float]) -> List[float]:
         """Normalize scores to 0-1 range using min-max normalization.
         
         Args:
-            scores: List of scores
+            scores: Scores as a list or array
             
         Returns:
             Normalized scores
         """
-        if not scores:
-            return []
-        
-        if len(scores) == 1:
-            return [1.0]
-        
-        scores_array = np.array(scores)
-        min_score = scores_array.min()
-        max_score = scores_array.max()
-        
-        if max_score == min_score:
-            return [1.0] * len(scores)
-        
-        normalized = (scores_array - min_score) / (max_score - min_score)
-        return normalized.tolist()
+        return _min_max_normalize(scores).tolist()
     
     def get_chunk_context(
         self,
@@ -266,22 +463,22 @@ class Retriever:
             snippet = text
         else:
             # Try to find query in text for context
-            query_words = query.lower().split()
+            lower_text = chunk.lower_text
             best_pos = 0
             
-            for word in query_words:
-                pos = text.lower().find(word)
+            for word in _query_words(query):
+                pos = lower_text.find(word)
                 if pos != -1:
                     # Center around the found word
                     start = max(0, pos - snippet_length // 2)
                     best_pos = start
                     break
             
-            snippet = text[best_pos:best_pos + snippet_length]
-            if best_pos > 0:
-                snippet = "..." + snippet
-            if best_pos + snippet_length < len(text):
-                snippet = snippet + "..."
+            # Build the snippet in one step instead of concatenating twice
+            end = best_pos + snippet_length
+            prefix = "..." if best_pos > 0 else ""
+            suffix = "..." if end < len(text) else ""
+            snippet = f"{prefix}{text[best_pos:end]}{suffix}"
         
         return snippet
     
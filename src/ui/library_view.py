@@ -15,8 +15,7 @@ from typing import List
 from ..core.database import Database
 from ..core.models import Document, DocumentStatus
 from ..indexing.ingestion import Ingestion
-from ..indexing.extractor import Extractor
-from ..indexing.chunker import Chunker
+from ..indexing.pipeline import extract_and_chunk
 from ..indexing.embedder import Embedder
 from ..indexing.index_store import FAISSIndexStore
 
@@ -65,58 +64,57 @@ class IndexingWorker(QThread):
             
             self.progress.emit(10, 100, f"Found {total_docs} documents to process")
             
-            # Phase 2: Extract and chunk
-            extractor = Extractor()
-            chunker = Chunker(chunk_size=500, chunk_overlap=100)
+            # Phase 2: Extract and chunk (documents in parallel worker
+            # processes; the database is only written from this thread)
+            import uuid
+            from ..core.models import Chunk
             
             processed = 0
             
-            for doc in pending_docs:
-                if not self._is_running:
-                    self.finished.emit(False, "Indexing cancelled")
-                    return
-                
-                try:
-                    # Extract text
-                    extracted_doc = extractor.extract(doc.path)
-                    
-                    # Chunk text - convert pages to list of tuples
-                    page_tuples = [(p.page_number, p.text) for p in extracted_doc.pages]
-                    text_chunks = chunker.chunk_pages(page_tuples)
+            # Defer FTS5 merges until every document is in
+            with db.bulk_ingest():
+                for doc, text_chunks, error in extract_and_chunk(
+                    pending_docs, chunk_size=500, chunk_overlap=100
+                ):
+                    if not self._is_running:
+                        self.finished.emit(False, "Indexing cancelled")
+                        return
                     
-                    # Convert TextChunk to Chunk and add to database
-                    import uuid
-                    from ..core.models import Chunk
-                    
-                    for text_chunk in text_chunks:
-                        chunk = Chunk(
-                            id=str(uuid.uuid4()),
-                            document_id=doc.id,
-                            page=text_chunk.page_number,
-                            start_offset=text_chunk.start_offset,
-                            end_offset=text_chunk.end_offset,
-                            text=text_chunk.text,
-                            text_hash=text_chunk.text_hash
+                    try:
+                        if error is not None:
+                            raise error
+                        
+                        # Convert TextChunk to Chunk and add to database
+                        db.add_chunks(
+                            Chunk(
+                                id=str(uuid.uuid4()),
+                                document_id=doc.id,
+                                page=text_chunk.page_number,
+                                start_offset=text_chunk.start_offset,
+                                end_offset=text_chunk.end_offset,
+                                text=text_chunk.text,
+                                text_hash=text_chunk.text_hash
+                            )
+                            for text_chunk in text_chunks
                         )
-                        db.add_chunk(chunk)
-                    
-                    # Update document status
-                    doc.status = DocumentStatus.INDEXED
-                    db.update_document(doc)
-                    
-                    processed += 1
-                    progress_pct = 10 + int((processed / total_docs) * 70)
-                    self.progress.emit(
-                        progress_pct,
-                        100,
-                        f"Processed {processed}/{total_docs}: {doc.title}"
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {doc.path}: {e}")
-                    doc.status = DocumentStatus.ERROR
-                    doc.error_message = str(e)
-                    db.update_document(doc)
+                        
+                        # Update document status
+                        doc.status = DocumentStatus.INDEXED
+                        db.update_document(doc)
+                        
+                        processed += 1
+                        progress_pct = 10 + int((processed / total_docs) * 70)
+                        self.progress.emit(
+                            progress_pct,
+                            100,
+                            f"Processed {processed}/{total_docs}: {doc.title}"
+                        )
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing {doc.path}: {e}")
+                        doc.status = DocumentStatus.ERROR
+                        doc.error_message = str(e)
+                        db.update_document(doc)
             
             # Phase 3: Generate embeddings and build FAISS index
             self.progress.emit(80, 100, "Generating embeddings...")
@@ -136,16 +134,17 @@ class IndexingWorker(QThread):
                 if chunks:
                     # Generate embeddings
                     self.progress.emit(85, 100, f"Embedding {len(chunks)} chunks...")
-                    embeddings = embedder.embed_batch(chunk_texts, batch_size=32)
+                    embeddings = embedder.embed_batch(chunk_texts)
                     
                     # Build FAISS index
                     self.progress.emit(90, 100, "Building search index...")
-                    index_store = FAISSIndexStore(
+                    index_store = FAISSIndexStore.for_corpus_size(
                         dimension=embedder.dimension,
-                        index_type='Flat'
+                        num_vectors=len(chunks)
                     )
                     chunk_ids = [c.id for c in chunks]
-                    index_store.add(chunk_ids, embeddings)
+                    # The embeddings are not used again, so skip the copy
+                    index_store.add(chunk_ids, embeddings, copy=False)
                     
                     # Save index
                     data_dir = self.db_path.parent
@@ -188,6 +187,7 @@ class LibraryView(QWidget):
     """View for managing document library and indexing."""
     
     status_message = Signal(str)
+    index_updated = Signal()  # An indexing run saved a new FAISS index
     
     def __init__(self, db_path: Path):
         super().__init__()
@@ -409,6 +409,7 @@ class LibraryView(QWidget):
         self.progress_label.setVisible(False)
         
         if success:
+            self.index_updated.emit()
             QMessageBox.information(self, "Indexing Complete", message)
             self.status_message.emit(message)
         else:
@@ -423,8 +424,9 @@ class LibraryView(QWidget):
     def _load_statistics(self):
         """Load and display index statistics."""
         try:
-            doc_count = self.db.get_document_count()
-            chunk_count = self.db.get_chunk_count()
+            # Indexing writes through another Database instance
+            doc_count = self.db.get_document_count(use_cache=False)
+            chunk_count = self.db.get_chunk_count(use_cache=False)
             
             # Get error count
             error_docs = [
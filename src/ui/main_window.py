@@ -100,6 +100,9 @@ class MainWindow(QMainWindow):
         self.search_view.status_message.connect(self.show_status_message)
         self.ask_view.status_message.connect(self.show_status_message)
         
+        # Pick up the new index once indexing finishes
+        self.library_view.index_updated.connect(self.search_view.reload_index)
+        
         # Set central widget
         self.setCentralWidget(self.tab_widget)
     
@@ -6,10 +6,13 @@ from PySide6.QtWidgets import (
     QTextEdit, QLabel, QGroupBox, QSplitter, QMessageBox,
     QFileDialog
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QThread, QTimer
 from pathlib import Path
+import html
 import logging
+import os
 from datetime import datetime
+from typing import Optional
 
 from ..core.database import Database
 from ..indexing.embedder import Embedder
@@ -19,52 +22,165 @@ from ..search.retriever import Retriever, SearchResult
 logger = logging.getLogger(__name__)
 
 
+class RetrieverLoader(QThread):
+    """Worker thread that loads the embedder and FAISS index.
+    
+    Model loading and index reads take a few seconds, so they run here
+    instead of blocking the window from opening.
+    """
+    
+    ready = Signal(object)  # Retriever with semantic search
+    failed = Signal(str)  # error message
+    
+    def __init__(
+        self,
+        db: Database,
+        index_path: Path,
+        map_path: Path,
+        embedder: Optional[Embedder] = None
+    ):
+        super().__init__()
+        self.db = db
+        self.index_path = index_path
+        self.map_path = map_path
+        self.embedder = embedder  # Reused when reloading the index
+    
+    def run(self):
+        """Load the embedder and index, then emit the full retriever."""
+        try:
+            embedder = self.embedder or Embedder()
+            # Stay on CPU: the search box runs one query at a time, where a
+            # GPU index is slower than the CPU one
+            # The saved mapping sets the actual index type (Flat or IVF)
+            index_store = FAISSIndexStore(
+                dimension=embedder.dimension,
+                index_type='Flat',
+                gpu=False
+            )
+            # Windows cannot replace a file while it is mapped, which would
+            # make the next indexing run fail to save, so read it there
+            index_store.load(self.index_path, self.map_path, mmap=os.name != 'nt')
+            
+            self.ready.emit(Retriever(
+                db=self.db,
+                embedder=embedder,
+                index_store=index_store
+            ))
+        except Exception as e:
+            logger.error(f"Error loading semantic search: {e}")
+            self.failed.emit(str(e))
+
+
 class SearchView(QWidget):
     """View for searching documents."""
     
     status_message = Signal(str)
     
+    # Preview pane HTML; values are escaped before formatting
+    PREVIEW_TMPL = (
+        "<h3>{title}</h3>\n"
+        "<p><b>Path:</b> {path}</p>\n"
+        "{page_row}"
+        "<p><b>Score:</b> {score:.3f}</p>\n"
+        "<p><b>Rank:</b> #{rank}</p>\n"
+        "<hr>\n"
+        "<h4>Text Content:</h4>\n"
+        "<p>{text}</p>"
+    )
+    PREVIEW_PAGE_ROW = "<p><b>Page:</b> {page}</p>\n"
+    
+    # Debounce delay for incremental keyword search (ms)
+    KEYWORD_DEBOUNCE_MS = 120
+    
     def __init__(self, db_path: Path):
         super().__init__()
         self.db_path = db_path
         self.db = Database(db_path)
         self.retriever = None
+        self.retriever_loader = None
+        self._reload_pending = False
         self.current_results = []
         
         self._init_retriever()
         self._init_ui()
     
     def _init_retriever(self):
-        """Initialize the retriever with embedder and index if available."""
-        try:
-            # Check if FAISS index exists
-            data_dir = self.db_path.parent
-            index_path = data_dir / "embeddings.index"
-            map_path = data_dir / "embeddings.map"
-            
-            if index_path.exists() and map_path.exists():
-                # Load embedder and FAISS index
-                embedder = Embedder()
-                index_store = FAISSIndexStore(
-                    dimension=embedder.dimension,
-                    index_type='Flat'
-                )
-                index_store.load(index_path, map_path)
-                
-                self.retriever = Retriever(
-                    db=self.db,
-                    embedder=embedder,
-                    index_store=index_store
-                )
-                logger.info("Retriever initialized with semantic search")
-            else:
-                # Keyword-only retriever
-                self.retriever = Retriever(db=self.db)
-                logger.info("Retriever initialized (keyword-only)")
-                
-        except Exception as e:
-            logger.error(f"Error initializing retriever: {e}")
-            self.retriever = Retriever(db=self.db)
+        """Initialize the retriever.
+        
+        Keyword search is available immediately. If a FAISS index exists,
+        the embedder and index are loaded in the background and the full
+        retriever replaces the keyword-only one when ready.
+        """
+        # Keyword-only retriever until semantic search is loaded
+        self.retriever = Retriever(db=self.db)
+        
+        if self._load_semantic():
+            logger.info("Retriever initialized (keyword-only), loading semantic search")
+        else:
+            logger.info("Retriever initialized (keyword-only)")
+    
+    def _load_semantic(self) -> bool:
+        """Start loading the FAISS index in the background, if one exists.
+        
+        Returns:
+            True if loading was started
+        """
+        data_dir = self.db_path.parent
+        index_path = data_dir / "embeddings.index"
+        map_path = data_dir / "embeddings.map"
+        
+        if not (index_path.exists() and map_path.exists()):
+            return False
+        
+        self.retriever_loader = RetrieverLoader(
+            self.db, index_path, map_path, embedder=self.retriever.embedder
+        )
+        self.retriever_loader.ready.connect(self._on_retriever_ready)
+        self.retriever_loader.failed.connect(self._on_retriever_failed)
+        self.retriever_loader.start()
+        return True
+    
+    def reload_index(self):
+        """Load the index again after an indexing run saved a new one.
+        
+        The current retriever keeps searching the previous index until the
+        new one is ready.
+        """
+        if self.retriever_loader is not None:
+            # The running load may have read the old files; load again after
+            self._reload_pending = True
+            return
+        
+        if self._load_semantic():
+            self.status_message.emit("Loading updated search index...")
+    
+    def _finish_loading(self):
+        """Clear the finished loader and start a reload that was requested."""
+        self.retriever_loader = None
+        if self._reload_pending:
+            self._reload_pending = False
+            self._load_semantic()
+        self._update_mode_tabs()
+    
+    def _on_retriever_ready(self, retriever: Retriever):
+        """Swap in the retriever with semantic search."""
+        self.retriever = retriever
+        self._finish_loading()
+        logger.info("Retriever initialized with semantic search")
+        self.status_message.emit("Semantic search ready")
+    
+    def _on_retriever_failed(self, message: str):
+        """Keep the current retriever if loading failed."""
+        self._finish_loading()
+        self.status_message.emit(f"Semantic search unavailable: {message}")
+    
+    def _has_semantic(self) -> bool:
+        """Check if the current retriever supports semantic search."""
+        return (
+            self.retriever is not None and
+            self.retriever.embedder is not None and
+            self.retriever.index_store is not None
+        )
     
     def _init_ui(self):
         """Initialize the user interface."""
@@ -80,8 +196,14 @@ class SearchView(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Enter your search query...")
         self.search_input.returnPressed.connect(self._perform_search)
+        self.search_input.textChanged.connect(self._on_search_text_changed)
         input_layout.addWidget(self.search_input)
         
+        # Incremental search fires once typing pauses
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.timeout.connect(self._perform_incremental_search)
+        
         self.search_btn = QPushButton("🔍 Search")
         self.search_btn.clicked.connect(self._perform_search)
         input_layout.addWidget(self.search_btn)
@@ -153,29 +275,49 @@ class SearchView(QWidget):
     
     def _update_mode_tabs(self):
         """Update available search mode tabs based on retriever capabilities."""
-        has_semantic = (
-            self.retriever and 
-            self.retriever.embedder is not None and 
-            self.retriever.index_store is not None
-        )
+        has_semantic = self._has_semantic()
         
         # Enable/disable tabs
         self.mode_tabs.setTabEnabled(1, has_semantic)  # Semantic
         self.mode_tabs.setTabEnabled(2, has_semantic)  # Hybrid
         
-        if not has_semantic:
+        if has_semantic:
+            self.mode_tabs.setTabText(1, "🧠 Semantic")
+            self.mode_tabs.setTabText(2, "⚡ Hybrid")
+        else:
+            suffix = "Loading..." if self.retriever_loader else "Index Required"
             self.mode_tabs.setTabText(
                 1,
-                "🧠 Semantic (Index Required)"
+                f"🧠 Semantic ({suffix})"
             )
             self.mode_tabs.setTabText(
                 2,
-                "⚡ Hybrid (Index Required)"
+                f"⚡ Hybrid ({suffix})"
             )
             self.mode_tabs.setCurrentIndex(0)  # Default to keyword
     
+    def _on_search_text_changed(self, text: str):
+        """Schedule an incremental keyword search while the user types.
+        
+        Each keystroke restarts the timer, so a pending search is dropped
+        in favor of the newer query. Semantic and hybrid searches embed the
+        query on this (GUI) thread, so they only run on Enter or the button.
+        """
+        if not text.strip() or self._current_mode() != 'keyword':
+            self._debounce.stop()
+            return
+        
+        self._debounce.setInterval(self.KEYWORD_DEBOUNCE_MS)
+        self._debounce.start()
+    
+    def _current_mode(self) -> str:
+        """Get the selected search mode name."""
+        mode_names = ['keyword', 'semantic', 'hybrid']
+        return mode_names[self.mode_tabs.currentIndex()]
+    
     def _perform_search(self):
         """Perform search based on selected mode."""
+        self._debounce.stop()
         query = self.search_input.text().strip()
         
         if not query:
@@ -186,10 +328,31 @@ class SearchView(QWidget):
             )
             return
         
-        # Get search mode
-        mode_index = self.mode_tabs.currentIndex()
-        mode_names = ['keyword', 'semantic', 'hybrid']
-        mode = mode_names[mode_index]
+        self._run_search(query)
+    
+    def _perform_incremental_search(self):
+        """Search as the user types, without dialogs for partial queries."""
+        # The mode may have changed since the timer was started
+        if self._current_mode() != 'keyword':
+            return
+        query = self.search_input.text().strip()
+        if query:
+            self._run_search(query, incremental=True)
+    
+    def _run_search(self, query: str, incremental: bool = False):
+        """Run a search and display the results.
+        
+        Args:
+            query: Search query
+            incremental: Whether the search was triggered by typing. Errors
+                from incomplete queries are only shown in the status bar.
+        """
+        mode = self._current_mode()
+        
+        # Semantic modes need the background-loaded retriever
+        if mode != 'keyword' and not self._has_semantic():
+            self.status_message.emit("Semantic search is not available yet")
+            return
         
         try:
             # Perform search
@@ -210,6 +373,11 @@ class SearchView(QWidget):
             )
             
         except Exception as e:
+            if incremental:
+                logger.debug(f"Incremental search error: {e}")
+                self.status_message.emit("Search failed")
+                return
+            
             logger.error(f"Search error: {e}", exc_info=True)
             QMessageBox.critical(
                 self,
@@ -265,19 +433,19 @@ class SearchView(QWidget):
             self.preview_text.setText("Document not found")
             return
         
-        # Build preview
-        preview = f"<h3>{doc.title}</h3>\n"
-        preview += f"<p><b>Path:</b> {doc.path}</p>\n"
-        
+        # Build preview from the template in one pass
+        page_row = ""
         if result.chunk.page:
-            preview += f"<p><b>Page:</b> {result.chunk.page}</p>\n"
-        
-        preview += f"<p><b>Score:</b> {result.score:.3f}</p>\n"
-        preview += f"<p><b>Rank:</b> #{result.rank}</p>\n"
+            page_row = self.PREVIEW_PAGE_ROW.format(page=result.chunk.page)
         
-        preview += "<hr>\n"
-        preview += "<h4>Text Content:</h4>\n"
-        preview += f"<p>{result.chunk.text}</p>"
+        preview = self.PREVIEW_TMPL.format_map({
+            'title': html.escape(doc.title),
+            'path': html.escape(doc.path),
+            'page_row': page_row,
+            'score': result.score,
+            'rank': result.rank,
+            'text': html.escape(result.chunk.text),
+        })
         
         self.preview_text.setHtml(preview)
     
@@ -356,4 +524,5 @@ class SearchView(QWidget):
     
     def cleanup(self):
         """Clean up resources."""
-        pass
+        if self.retriever_loader and self.retriever_loader.isRunning():
+            self.retriever_loader.wait()
@@ -31,9 +31,8 @@ def demo_japanese_tokenization():
     
     for text in test_texts:
         print(f"Original:  {text}")
-        tokenized = tokenizer.tokenize(text)
+        tokenized, tokens = tokenizer.parse(text)
         print(f"Tokenized: {tokenized}")
-        tokens = tokenizer.get_tokens_list(text)
         print(f"Tokens:    {tokens}")
         print(f"Count:     {len(tokens)} tokens")
         print("-" * 60)
@@ -1,6 +1,7 @@
 """Integration test for Phase 3 search functionality."""
 
 import sys
+import time
 from pathlib import Path
 
 # Add project root to path
@@ -79,13 +80,32 @@ def main():
         print(f"✓ Added 3 vectors to index")
         print(f"✓ Index size: {index_store.size}")
         
-        # Test search
-        query_emb = embedder.embed("Test one")
-        search_results = index_store.search(query_emb, k=2)
-        print(f"✓ FAISS search returned {len(search_results)} results")
+        # Test batch search (one FAISS call for all queries)
+        batch_queries = embedder.embed_batch(["Test one", "Test two", "Test three"])
+        assert batch_queries.ndim == 2
+        batch_results = index_store.search_batch(batch_queries, k=2)
+        assert len(batch_results) == 3
+        assert all(len(r) == 2 for r in batch_results)
+        search_results = batch_results[0]
+        print(f"✓ FAISS batch search returned {len(batch_results)} x {len(search_results)} results")
         if search_results:
             print(f"  Top result: chunk_id={search_results[0][0]}, score={search_results[0][1]:.3f}")
         
+        # Compare batched search against one search call per query
+        many_queries = embedder.embed_batch([f"Test query {i}" for i in range(32)])
+        start = time.perf_counter()
+        single_results = [index_store.search(query_emb, k=2) for query_emb in many_queries]
+        single_time = time.perf_counter() - start
+        start = time.perf_counter()
+        many_results = index_store.search_batch(many_queries, k=2)
+        batch_time = time.perf_counter() - start
+        assert len(many_results) == len(single_results)
+        for batched, single in zip(many_results, single_results):
+            assert [chunk_id for chunk_id, _ in batched] == [chunk_id for chunk_id, _ in single]
+            assert all(abs(b - s) < 1e-5 for (_, b), (_, s) in zip(batched, single))
+        print(f"✓ {len(many_queries)} queries: {single_time * 1000:.2f} ms one by one, "
+              f"{batch_time * 1000:.2f} ms batched")
+        
     except Exception as e:
         print(f"❌ FAISS Index Store failed: {e}")
         import traceback
@@ -103,8 +123,31 @@ def main():
         kw_results = retriever.keyword_search("test", limit=3)
         print(f"  ✓ Keyword search: {len(kw_results)} results")
         
-        # Note: Semantic search won't work well with our tiny test index
-        # In real usage, you'd need to index all chunks first
+        # Semantic search needs real chunk ids, so index a sample of chunks
+        sample_chunks = []
+        for doc in db.get_all_documents():
+            sample_chunks.extend(db.get_chunks_by_document(doc.id))
+            if len(sample_chunks) >= 64:
+                break
+        sample_chunks = sample_chunks[:64]
+        sample_store = FAISSIndexStore(dimension=embedder.dimension, index_type='Flat')
+        sample_store.add(
+            [chunk.id for chunk in sample_chunks],
+            embedder.embed_batch([chunk.text for chunk in sample_chunks])
+        )
+        sample_retriever = Retriever(db=db, embedder=embedder, index_store=sample_store)
+        
+        # Batched semantic search matches one semantic_search call per query
+        print("\n  Testing batched semantic search...")
+        queries = [chunk.text[:50] for chunk in sample_chunks[:8]]
+        queries += ["machine learning", "search", "document", "data"] * 2
+        batch_semantic = sample_retriever.semantic_search_batch(queries, limit=3)
+        assert len(batch_semantic) == len(queries)
+        for query, batched in zip(queries, batch_semantic):
+            single = sample_retriever.semantic_search(query, limit=3)
+            assert [r.chunk.id for r in batched] == [r.chunk.id for r in single]
+            assert all(abs(b.score - s.score) < 1e-5 for b, s in zip(batched, single))
+        print(f"  ✓ Batched semantic search matches {len(queries)} single searches")
         
     except Exception as e:
         print(f"❌ Retriever failed: {e}")
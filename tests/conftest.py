@@ -0,0 +1,156 @@
+"""Shared pytest fixtures."""
+
+import hashlib
+import json
+import os
+import threading
+
+# Under pytest-xdist every worker would otherwise start one OpenMP/BLAS
+# thread per core. Give each worker an equal share of the cores; this must
+# be set before numpy, FAISS or torch load their thread pools.
+_XDIST_WORKERS = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', '0'))
+if _XDIST_WORKERS:
+    _WORKER_THREADS = str(max(1, (os.cpu_count() or 1) // _XDIST_WORKERS))
+    for _var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ.setdefault(_var, _WORKER_THREADS)
+
+import faiss
+import numpy as np
+import pytest
+
+from src.indexing.embedder import Embedder
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+_warm_embedder = Embedder(model_name=MODEL_NAME)
+_warm_thread = None
+_warm_error = None
+
+
+def pytest_addoption(parser):
+    """Add --runslow to include tests marked slow."""
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="also run tests marked @pytest.mark.slow"
+    )
+
+
+def pytest_configure(config):
+    """Register the slow marker and cap threads in xdist workers."""
+    config.addinivalue_line("markers", "slow: slow test, skipped unless --runslow is given")
+    
+    if _XDIST_WORKERS:
+        # In case FAISS or torch read the environment before this module ran
+        threads = int(os.environ['OMP_NUM_THREADS'])
+        faiss.omp_set_num_threads(threads)
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+
+def _warm_up():
+    """Load the model weights; a failure is re-raised by the fixture."""
+    global _warm_error
+    try:
+        _warm_embedder.model
+    except Exception as e:
+        _warm_error = e
+
+
+@pytest.hookimpl(trylast=True)  # See the items left after -k/-m deselection
+def pytest_collection_modifyitems(session, config, items):
+    """Skip slow tests and start loading the embedding model.
+    
+    Tests marked slow are skipped unless --runslow is given.
+    
+    The model takes a few seconds to load. Starting as soon as collection
+    is done overlaps that with the tests that run before the first one
+    needing the embedder. Nothing is loaded if no selected test uses it.
+    """
+    global _warm_thread
+    
+    if not config.getoption("--runslow"):
+        skip_slow = pytest.mark.skip(reason="slow test, use --runslow to run")
+        items_to_run = []
+        for item in items:
+            if "slow" in item.keywords:
+                item.add_marker(skip_slow)
+            else:
+                items_to_run.append(item)
+        items = items_to_run
+    
+    # With pytest-xdist the controller runs no tests; only workers warm up
+    if not hasattr(config, 'workerinput') and config.getoption('numprocesses', None):
+        return
+    
+    if any('embedder' in getattr(item, 'fixturenames', ()) for item in items):
+        _warm_thread = threading.Thread(target=_warm_up, daemon=True)
+        _warm_thread.start()
+
+
+@pytest.fixture(scope="session")
+def embedder():
+    """Create one embedder for the whole run (model loads once).
+    
+    Under pytest-xdist each worker is its own session, so every worker
+    loads the model once rather than once per test.
+    """
+    if _warm_thread is not None:
+        _warm_thread.join()
+    if _warm_error is not None:
+        raise _warm_error
+    return _warm_embedder
+
+
+# Bump when the way embeddings are computed changes, to drop cached ones
+EMBEDDING_CACHE_VERSION = 1
+
+
+@pytest.fixture(scope="session")
+def cached_embed_batch(request, embedder):
+    """Embed texts through an on-disk cache shared by runs and workers.
+    
+    Fixture corpora are the same on every run, so their embeddings are
+    stored under pytest's cache directory, keyed by the texts and by every
+    embedder setting that changes the vectors. Under pytest-xdist, workers
+    that build the same fixture read one file instead of each running the
+    model. Pass --cache-clear to drop the cache; with the cache plugin
+    disabled (-p no:cacheprovider) texts are always embedded.
+    """
+    def embed(texts):
+        return embedder.embed_batch(texts, batch_size=len(texts))
+    
+    cache = getattr(request.config, 'cache', None)
+    if cache is None:
+        return embed
+    cache_dir = cache.mkdir("embeddings")
+    
+    # fp16 only takes effect when the model runs on a CUDA device
+    config = json.dumps({
+        'version': EMBEDDING_CACHE_VERSION,
+        'model': embedder.model_name,
+        'half_precision': embedder.fp16 and embedder.model.device.type == 'cuda',
+        'normalize': True,
+        'dtype': 'float32',
+    }, sort_keys=True)
+    
+    def embed_batch(texts):
+        key = hashlib.sha256(config.encode('utf-8'))
+        for text in texts:
+            key.update(hashlib.sha256(text.encode('utf-8')).digest())
+        path = cache_dir / f"{key.hexdigest()}.npy"
+        
+        if path.exists():
+            return np.load(path)
+        
+        embeddings = embed(texts)
+        # Write then rename, so a concurrent worker never reads a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, embeddings)
+        os.replace(tmp_path, path)
+        return embeddings
+    
+    return embed_batch
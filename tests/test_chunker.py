@@ -1,7 +1,7 @@
 """Tests for the chunker module."""
 import pytest
 
-from src.indexing.chunker import Chunker, TextChunk
+from src.indexing.chunker import Chunker, TextChunk, XXHASH_AVAILABLE
 
 
 @pytest.fixture
@@ -162,6 +162,14 @@ def test_hash_generation(chunker):
     assert chunks1[0].text_hash == chunks2[0].text_hash
 
 
+def test_hash_format(chunker):
+    """Test hashes are hex strings of the backend's length."""
+    text_hash = chunker._generate_hash("Test text for hashing.")
+    
+    assert len(text_hash) == (16 if XXHASH_AVAILABLE else 64)
+    int(text_hash, 16)  # Valid hex
+
+
 def test_different_text_different_hash(chunker):
     """Test that different texts produce different hashes."""
     chunk1 = chunker.chunk_text("Text A " * 10, page_number=1)
@@ -189,6 +197,18 @@ def test_chunk_real_pdf_text(large_chunker):
     assert 1 in page_nums  # At least page 1 should be there
 
 
+def test_chunk_pages_parallel(chunker):
+    """Test parallel chunking matches serial chunking."""
+    pages = [(i, f"Page {i} text. " * 20) for i in range(1, 9)]
+    serial = chunker.chunk_pages(pages, max_workers=1)
+    
+    chunker.PARALLEL_MIN_PAGES = 4
+    parallel = chunker.chunk_pages(pages, max_workers=2)
+    
+    assert parallel == serial
+    assert [c.page_number for c in parallel] == [c.page_number for c in serial]
+
+
 def test_chunk_pages_convenience(large_chunker):
     """Test the convenience method for chunking pages."""
     from src.indexing.extractor import Extractor
@@ -1,7 +1,5 @@
 """Tests for configuration management."""
 import pytest
-import tempfile
-import os
 
 from src.core.database import Database
 from src.core.config import Config
@@ -10,12 +8,8 @@ from src.core.models import GenerationMode
 
 @pytest.fixture
 def temp_config():
-    """Create a temporary config for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = os.path.join(tmpdir, "test.db")
-        db = Database(db_path)
-        config = Config(db)
-        yield config
+    """Create a config backed by an in-memory database for testing."""
+    return Config(Database(":memory:"))
 
 
 def test_default_settings(temp_config):
@@ -72,6 +66,23 @@ def test_remove_included_path(temp_config):
     assert '/test/path2' in settings.included_paths
 
 
+def test_get_settings_cached_copy(temp_config):
+    """Test settings are cached but returned as independent copies."""
+    settings = temp_config.get_settings()
+    settings.included_paths.append('/not/saved')
+    settings.allowed_ext.append('.docx')
+    
+    fresh = temp_config.get_settings()
+    assert fresh.included_paths == []
+    assert fresh.allowed_ext == Config.DEFAULT_ALLOWED_EXT
+    assert Config.DEFAULT_ALLOWED_EXT == ['.pdf', '.txt', '.md']
+    
+    # Saving refreshes the cache
+    fresh.top_k = 42
+    temp_config.save_settings(fresh)
+    assert temp_config.get_settings().top_k == 42
+
+
 def test_validate_settings_chunk_size(temp_config):
     """Test validation of chunk size."""
     settings = temp_config.get_settings()
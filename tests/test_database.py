@@ -1,7 +1,5 @@
 """Tests for database operations."""
 import pytest
-import tempfile
-import os
 from pathlib import Path
 from datetime import datetime
 import uuid
@@ -12,19 +10,24 @@ from src.core.models import Document, Chunk, Embedding, IndexJob, DocumentStatus
 
 @pytest.fixture
 def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = os.path.join(tmpdir, "test.db")
-        db = Database(db_path)
-        yield db
+    """Create an in-memory database for testing."""
+    return Database(":memory:")
 
 
-def test_database_creation(temp_db):
+@pytest.fixture
+def on_disk_db(tmp_path):
+    """Create a temporary file-backed database for testing."""
+    db = Database(tmp_path / "test.db")
+    yield db
+    db.close()
+
+
+def test_database_creation(on_disk_db):
     """Test that database and tables are created."""
-    assert temp_db.db_path.exists()
+    assert on_disk_db.db_path.exists()
     
     # Check that tables exist
-    with temp_db.get_connection() as conn:
+    with on_disk_db.get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT name FROM sqlite_master 
@@ -41,6 +44,15 @@ def test_database_creation(temp_db):
         assert 'chunks_fts' in tables
 
 
+def test_connection_pragmas(on_disk_db):
+    """Test that connections use WAL and the tuned pragmas."""
+    with on_disk_db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
 def test_add_and_get_document(temp_db):
     """Test adding and retrieving a document."""
     doc = Document(
@@ -82,6 +94,28 @@ def test_get_document_by_path(temp_db):
     assert retrieved.id == doc.id
 
 
+def test_get_document_by_path_uses_covering_index(temp_db):
+    """Test path lookups are answered from the covering index."""
+    # Capture the statement get_document_by_path actually runs
+    statements = []
+    with temp_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        temp_db.get_document_by_path("/test/doc.pdf")
+    finally:
+        with temp_db.get_connection() as conn:
+            conn.set_trace_callback(None)
+    
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 1
+    
+    with temp_db.get_connection() as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN " + selects[0]).fetchall()
+    
+    details = " ".join(row['detail'] for row in plan)
+    assert "COVERING INDEX idx_documents_path_covering" in details
+
+
 def test_update_document_status(temp_db):
     """Test updating document status."""
     doc = Document(
@@ -129,6 +163,49 @@ def test_document_unique_path_constraint(temp_db):
         temp_db.add_document(doc2)
 
 
+def test_add_documents_in_one_transaction(temp_db):
+    """Test bulk-adding documents, and that a failing batch adds nothing."""
+    docs = [
+        Document(
+            id=f"doc_{i}",
+            path=f"/test/doc_{i}.pdf",
+            title=f"Document {i}",
+            ext=".pdf",
+            mtime=datetime.now(),
+            size=1024,
+            status=DocumentStatus.PENDING
+        )
+        for i in range(3)
+    ]
+    temp_db.add_documents(docs)
+    
+    assert [temp_db.get_document(doc.id).path for doc in docs] == [doc.path for doc in docs]
+    
+    duplicate = Document(
+        id="doc_dup",
+        path="/test/doc_0.pdf",
+        title="Duplicate",
+        ext=".pdf",
+        mtime=datetime.now(),
+        size=1024,
+        status=DocumentStatus.PENDING
+    )
+    new = Document(
+        id="doc_new",
+        path="/test/new.pdf",
+        title="New",
+        ext=".pdf",
+        mtime=datetime.now(),
+        size=1024,
+        status=DocumentStatus.PENDING
+    )
+    with pytest.raises(Exception):
+        temp_db.add_documents([new, duplicate])
+    
+    assert temp_db.get_document("doc_new") is None
+    assert len(temp_db.get_all_documents()) == 3
+
+
 def test_add_and_get_chunk(temp_db):
     """Test adding and retrieving chunks."""
     # First add a document
@@ -177,8 +254,8 @@ def test_get_chunks_by_document(temp_db):
     temp_db.add_document(doc)
     
     # Add multiple chunks
-    for i in range(3):
-        chunk = Chunk(
+    temp_db.add_chunks([
+        Chunk(
             id=str(uuid.uuid4()),
             document_id=doc.id,
             page=i + 1,
@@ -187,7 +264,8 @@ def test_get_chunks_by_document(temp_db):
             text=f"Chunk {i}",
             text_hash=f"hash{i}"
         )
-        temp_db.add_chunk(chunk)
+        for i in range(3)
+    ])
     
     chunks = temp_db.get_chunks_by_document(doc.id)
     assert len(chunks) == 3
@@ -258,8 +336,8 @@ def test_fts5_search(temp_db):
         text_hash="hash2"
     )
     
-    temp_db.add_chunk(chunk1)
-    temp_db.add_chunk(chunk2)
+    with temp_db.bulk_ingest():
+        temp_db.add_chunks([chunk1, chunk2])
     
     # Search for "Python"
     results = temp_db.search_chunks_fts("Python", limit=10)
@@ -269,6 +347,103 @@ def test_fts5_search(temp_db):
     # Search for "programming"
     results = temp_db.search_chunks_fts("programming", limit=10)
     assert len(results) == 2
+    
+    # A later batch gets new rowids and stays searchable
+    chunk3 = Chunk(
+        id=str(uuid.uuid4()),
+        document_id=doc.id,
+        page=3,
+        start_offset=200,
+        end_offset=300,
+        text="Rust is a systems programming language",
+        text_hash="hash3"
+    )
+    temp_db.add_chunks([chunk3])
+    results = temp_db.search_chunks_fts("Rust", limit=10)
+    assert [r[0] for r in results] == [chunk3.id]
+    
+    # Deleting chunks removes them from the FTS index
+    temp_db.delete_chunks_by_document(doc.id)
+    assert temp_db.search_chunks_fts("programming", limit=10) == []
+
+
+def test_bulk_ingest_restores_automerge(temp_db):
+    """Test bulk_ingest turns FTS5 automerge off and back on."""
+    def automerge():
+        with temp_db.get_connection() as conn:
+            row = conn.execute(
+                "SELECT v FROM chunks_fts_config WHERE k = 'automerge'"
+            ).fetchone()
+        return row['v'] if row else None
+    
+    with temp_db.bulk_ingest():
+        assert automerge() == 0
+    assert automerge() == 4
+    
+    # Restored even if the block raises
+    with pytest.raises(RuntimeError):
+        with temp_db.bulk_ingest():
+            raise RuntimeError("ingest failed")
+    assert automerge() == 4
+    
+    # A non-default setting is restored as it was
+    with temp_db.get_connection() as conn:
+        conn.execute("INSERT INTO chunks_fts(chunks_fts, rank) VALUES('automerge', 8)")
+    with temp_db.bulk_ingest():
+        assert automerge() == 0
+    assert automerge() == 8
+
+
+def test_bulk_ingest_optimizes_only_large_batches(temp_db):
+    """Test the whole FTS index is optimized only when a batch dominates it."""
+    doc = Document(
+        id=str(uuid.uuid4()),
+        path="/test/doc.pdf",
+        title="Test Document",
+        ext=".pdf",
+        mtime=datetime.now(),
+        size=1024,
+        status=DocumentStatus.INDEXED
+    )
+    temp_db.add_document(doc)
+    
+    def make_chunks(start, count):
+        return [
+            Chunk(
+                id=f"chunk_{i}",
+                document_id=doc.id,
+                page=1,
+                start_offset=0,
+                end_offset=10,
+                text=f"chunk number {i}",
+                text_hash=f"hash{i}"
+            )
+            for i in range(start, start + count)
+        ]
+    
+    def fts_commands(chunks):
+        statements = []
+        with temp_db.get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+        try:
+            with temp_db.bulk_ingest():
+                temp_db.add_chunks(chunks)
+        finally:
+            with temp_db.get_connection() as conn:
+                conn.set_trace_callback(None)
+        return [
+            command for command in ('optimize', 'merge')
+            if any(f"VALUES('{command}'" in statement for statement in statements)
+        ]
+    
+    # First load: the batch is the whole index
+    assert fts_commands(make_chunks(0, 20)) == ['optimize']
+    # Small incremental batch: bounded merge only
+    assert fts_commands(make_chunks(20, 2)) == ['merge']
+    # Nothing added: no merge work at all
+    assert fts_commands([]) == []
+    
+    assert len(temp_db.search_chunks_fts("number", limit=50)) == 22
 
 
 def test_add_and_get_embedding(temp_db):
@@ -335,9 +510,11 @@ def test_index_job_operations(temp_db):
 def test_settings_operations(temp_db):
     """Test saving and retrieving settings."""
     # Save settings
-    temp_db.save_setting('test_key', 'test_value')
-    temp_db.save_setting('test_list', [1, 2, 3])
-    temp_db.save_setting('test_dict', {'key': 'value'})
+    temp_db.save_settings_many({
+        'test_key': 'test_value',
+        'test_list': [1, 2, 3],
+        'test_dict': {'key': 'value'}
+    })
     
     # Retrieve settings
     assert temp_db.get_setting('test_key') == 'test_value'
@@ -349,6 +526,56 @@ def test_settings_operations(temp_db):
     all_settings = temp_db.get_all_settings()
     assert 'test_key' in all_settings
     assert all_settings['test_key'] == 'test_value'
+    
+    # Single saves overwrite batched ones
+    temp_db.save_setting('test_key', 'new_value')
+    assert temp_db.get_setting('test_key') == 'new_value'
+
+
+def test_settings_stdlib_json_compatible(temp_db):
+    """Test settings written by the stdlib json module still load."""
+    import json
+    
+    value = {'paths': ['/docs/機械学習'], 'top_k': 5}
+    with temp_db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?)",
+            ('legacy', json.dumps(value))
+        )
+    
+    assert temp_db.get_setting('legacy') == value
+    
+    # Values saved now are readable by the stdlib json module too
+    temp_db.save_setting('current', value)
+    with temp_db.get_connection() as conn:
+        row = conn.execute("SELECT value FROM settings WHERE key = 'current'").fetchone()
+    assert json.loads(row['value']) == value
+
+
+def test_settings_non_str_keys(temp_db):
+    """Test dicts with int keys save like json.dumps (keys become strings)."""
+    import json
+    
+    value = {1: 'one', 2: {3: [4]}}
+    temp_db.save_settings_many({'int_keys': value})
+    assert temp_db.get_setting('int_keys') == json.loads(json.dumps(value))
+    
+    temp_db.save_setting('int_keys', {5: 'five'})
+    assert temp_db.get_setting('int_keys') == {'5': 'five'}
+
+
+def test_settings_nan_literal_loads(temp_db):
+    """Test NaN written by json.dumps still loads."""
+    import json
+    import math
+    
+    with temp_db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?)",
+            ('legacy_nan', json.dumps({'score': float('nan')}))
+        )
+    
+    assert math.isnan(temp_db.get_setting('legacy_nan')['score'])
 
 
 def test_chunk_count(temp_db):
@@ -366,8 +593,8 @@ def test_chunk_count(temp_db):
     
     assert temp_db.get_chunk_count() == 0
     
-    for i in range(5):
-        chunk = Chunk(
+    temp_db.add_chunks([
+        Chunk(
             id=str(uuid.uuid4()),
             document_id=doc.id,
             page=1,
@@ -376,6 +603,108 @@ def test_chunk_count(temp_db):
             text=f"Chunk {i}",
             text_hash=f"hash{i}"
         )
-        temp_db.add_chunk(chunk)
+        for i in range(5)
+    ])
     
     assert temp_db.get_chunk_count() == 5
+    
+    # Deleting the document cascades to its chunks and clears the cache
+    temp_db.delete_document(doc.id)
+    assert temp_db.get_chunk_count() == 0
+
+
+def test_chunk_count_cache(on_disk_db):
+    """Test counts stay correct after writes, with and without the cache."""
+    temp_db = on_disk_db
+    assert temp_db.get_document_count() == 0
+    assert temp_db.get_document_count(use_cache=True) == 0
+    
+    doc_id = str(uuid.uuid4())
+    temp_db.add_document(Document(
+        id=doc_id,
+        path="/test/cached.pdf",
+        title="Cached",
+        ext=".pdf",
+        mtime=datetime.now(),
+        size=1,
+        status=DocumentStatus.PENDING
+    ))
+    temp_db.add_chunk(Chunk(
+        id=str(uuid.uuid4()),
+        document_id=doc_id,
+        page=1,
+        start_offset=0,
+        end_offset=4,
+        text="text",
+        text_hash="hash"
+    ))
+    
+    assert temp_db.get_document_count(use_cache=True) == 1
+    assert temp_db.get_chunk_count(use_cache=True) == 1
+    
+    # Writes through another instance are seen by the default count
+    other = Database(temp_db.db_path)
+    other.add_document(Document(
+        id=str(uuid.uuid4()),
+        path="/test/other.pdf",
+        title="Other",
+        ext=".pdf",
+        mtime=datetime.now(),
+        size=1,
+        status=DocumentStatus.PENDING
+    ))
+    other.close()
+    
+    assert temp_db.get_document_count() == 2
+    
+    temp_db.delete_document(doc_id)
+    assert temp_db.get_document_count(use_cache=True) == 1
+    assert temp_db.get_chunk_count(use_cache=True) == 0
+
+
+def test_in_memory_databases_are_separate():
+    """Test each in-memory database keeps its own data."""
+    db1 = Database(":memory:")
+    db2 = Database(":memory:")
+    
+    db1.save_setting('key', 'value')
+    
+    assert db1.get_setting('key') == 'value'
+    assert db2.get_setting('key') is None
+
+
+def test_close_and_reopen(on_disk_db):
+    """Test the connection reopens after close."""
+    on_disk_db.save_setting('key', 'value')
+    on_disk_db.close()
+    
+    assert on_disk_db.get_setting('key') == 'value'
+
+
+def test_close_and_reopen_in_memory():
+    """Test an in-memory database is usable (but empty) after close."""
+    db = Database(":memory:")
+    db.save_setting('key', 'value')
+    db.close()
+    
+    assert db.get_setting('key') is None
+    assert db.get_document_count() == 0
+    assert db.search_chunks_fts("test") == []
+    db.close()
+
+
+def test_shared_across_threads(temp_db):
+    """Test one instance can be used from several threads."""
+    import threading
+    
+    def worker(n):
+        for i in range(20):
+            temp_db.save_setting(f'thread_{n}_{i}', i)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert len(temp_db.get_all_settings()) == 80
@@ -11,13 +11,10 @@ from src.indexing.embedder import Embedder
 class TestEmbedder:
     """Test embedding generation."""
     
-    @pytest.fixture
-    def embedder(self):
-        """Create embedder instance."""
-        return Embedder(model_name='all-MiniLM-L6-v2')
-    
-    def test_embedder_initialization(self, embedder):
+    def test_embedder_initialization(self):
         """Test embedder initializes correctly."""
+        # Fresh instance: the shared fixture may already have loaded the model
+        embedder = Embedder(model_name='all-MiniLM-L6-v2')
         assert embedder.model_name == 'all-MiniLM-L6-v2'
         assert embedder._model is None  # Lazy loading
     
@@ -65,6 +62,24 @@ class TestEmbedder:
         assert embeddings.shape == (3, 384)
         assert not np.all(embeddings == 0)
     
+    def test_embed_batch_float16(self, embedder):
+        """Test half-precision batch embeddings."""
+        texts = ["First sentence.", "Second sentence."]
+        
+        embeddings = embedder.embed_batch(texts, dtype=np.float16)
+        assert embeddings.dtype == np.float16
+        assert embeddings.shape == (2, 384)
+        
+        # Similarity is computed in float32 and stays close to full precision
+        query_emb = embedder.embed("First sentence.")
+        similarities = embedder.similarity_batch(query_emb, embeddings)
+        assert similarities.dtype == np.float32
+        assert np.allclose(
+            similarities,
+            embedder.similarity_batch(query_emb, embedder.embed_batch(texts)),
+            atol=1e-2
+        )
+    
     def test_embed_batch_empty_list(self, embedder):
         """Test batch embedding with empty list."""
         embeddings = embedder.embed_batch([])
@@ -137,6 +152,14 @@ class TestEmbedder:
         # ML-related texts should have higher similarity
         assert similarities[1] > similarities[2]  # "Machine learning" vs "weather"
     
+    def test_embeddings_normalized(self, embedder):
+        """Test embeddings are unit length."""
+        embedding = embedder.embed("Test sentence.")
+        embeddings = embedder.embed_batch(["First.", "Second."])
+        
+        assert np.isclose(np.linalg.norm(embedding), 1.0, atol=1e-5)
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+    
     def test_similarity_zero_vector(self, embedder):
         """Test similarity with zero vector."""
         text = "Test sentence."
@@ -146,6 +169,16 @@ class TestEmbedder:
         sim = embedder.similarity(emb, zero_emb)
         assert sim == 0.0
     
+    def test_similarity_batch_zero_vectors(self, embedder):
+        """Test batch similarity with zero query and zero rows."""
+        embeddings = np.array([[1.0, 0.0], [0.0, 0.0], [0.6, 0.8]])
+        
+        similarities = embedder.similarity_batch(np.array([1.0, 0.0]), embeddings)
+        assert np.allclose(similarities, [1.0, 0.0, 0.6])
+        
+        similarities = embedder.similarity_batch(np.zeros(2), embeddings)
+        assert np.all(similarities == 0)
+    
     def test_cache_dir(self):
         """Test embedder with custom cache directory."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -1,14 +1,13 @@
 """Tests for the extractor module."""
 import pytest
-from pathlib import Path
 
 from src.indexing.extractor import Extractor, ExtractedDocument, ExtractedPage
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def extractor():
-    """Create extractor instance."""
-    return Extractor()
+    """Create extractor instance shared by all tests (extractions are cached)."""
+    return Extractor(cache_size=32)
 
 
 def test_extract_txt(extractor):
@@ -78,18 +77,13 @@ def test_extract_nonexistent_file(extractor):
         extractor.extract('/nonexistent/file.pdf')
 
 
-def test_extract_unsupported_format(extractor):
+def test_extract_unsupported_format(extractor, tmp_path):
     """Test extracting unsupported format."""
-    import tempfile
-    with tempfile.NamedTemporaryFile(suffix='.doc', delete=False) as f:
-        f.write(b'test')
-        temp_path = f.name
+    temp_path = tmp_path / "test.doc"
+    temp_path.write_bytes(b'test')
     
-    try:
-        with pytest.raises(ValueError, match='Unsupported file format'):
-            extractor.extract(temp_path)
-    finally:
-        Path(temp_path).unlink()
+    with pytest.raises(ValueError, match='Unsupported file format'):
+        extractor.extract(str(temp_path))
 
 
 def test_extract_with_error_handling(extractor):
@@ -122,48 +116,104 @@ def test_full_text_property(extractor):
     assert '\n\n' in full
 
 
-def test_extract_empty_pages(extractor):
+def test_extract_empty_pages(extractor, tmp_path):
     """Test that empty pages are skipped."""
-    import tempfile
     import fitz
     
-    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-        temp_path = f.name
-    
-    try:
-        # Create PDF with empty and non-empty pages
-        doc = fitz.open()
-        page1 = doc.new_page()
-        page1.insert_text((72, 72), 'Page with text')
-        page2 = doc.new_page()  # Empty page
-        page3 = doc.new_page()
-        page3.insert_text((72, 72), 'Another page')
-        doc.save(temp_path)
-        doc.close()
-        
-        # Extract
-        extracted = extractor.extract(temp_path)
-        
-        # Should only have 2 pages (empty page skipped)
-        assert len(extracted.pages) == 2
-        assert extracted.pages[0].page_number == 1
-        assert extracted.pages[1].page_number == 3
-        
-    finally:
-        Path(temp_path).unlink()
-
-
-def test_txt_encoding_fallback(extractor):
-    """Test TXT file encoding detection."""
-    import tempfile
+    temp_path = str(tmp_path / "test.pdf")
+    
+    # Create PDF with empty and non-empty pages
+    doc = fitz.open()
+    page1 = doc.new_page()
+    page1.insert_text((72, 72), 'Page with text')
+    page2 = doc.new_page()  # Empty page
+    page3 = doc.new_page()
+    page3.insert_text((72, 72), 'Another page')
+    doc.save(temp_path)
+    doc.close()
     
+    # Extract
+    extracted = extractor.extract(temp_path)
+    
+    # Should only have 2 pages (empty page skipped)
+    assert len(extracted.pages) == 2
+    assert extracted.pages[0].page_number == 1
+    assert extracted.pages[1].page_number == 3
+
+
+def test_txt_encoding_fallback(extractor, tmp_path):
+    """Test TXT file encoding detection."""
     # Test UTF-8
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
-        f.write('UTF-8 text with 日本語')
-        temp_path = f.name
-    
-    try:
-        doc = extractor.extract(temp_path)
-        assert '日本語' in doc.pages[0].text
-    finally:
-        Path(temp_path).unlink()
+    temp_path = tmp_path / "test.txt"
+    temp_path.write_text('UTF-8 text with 日本語', encoding='utf-8')
+    
+    doc = extractor.extract(str(temp_path))
+    assert '日本語' in doc.pages[0].text
+
+
+def test_extract_cached(extractor):
+    """Test repeated extraction reuses the cached result."""
+    pdf_path = 'tests/test_data/sample.pdf'
+    doc1 = extractor.extract(pdf_path)
+    doc2 = extractor.extract(pdf_path)
+    
+    # Separate documents sharing the same immutable pages
+    assert doc1 is not doc2
+    assert doc1.pages is not doc2.pages
+    assert doc1.pages[0] is doc2.pages[0]
+    
+    # Mutating one result does not affect later ones
+    doc1.pages.clear()
+    assert len(extractor.extract(pdf_path).pages) == len(doc2.pages)
+
+
+def test_extract_cache_invalidated_on_change(tmp_path):
+    """Test a modified file is extracted again."""
+    extractor = Extractor(cache_size=32)
+    txt_path = tmp_path / "note.txt"
+    txt_path.write_text("first version", encoding='utf-8')
+    assert extractor.extract(str(txt_path)).pages[0].text == "first version"
+    
+    txt_path.write_text("second, longer version", encoding='utf-8')
+    assert extractor.extract(str(txt_path)).pages[0].text == "second, longer version"
+
+
+def test_extract_cache_disabled():
+    """Test caching is off by default."""
+    extractor = Extractor()
+    extractor.extract('tests/test_data/sample.txt')
+    assert len(extractor._cache) == 0
+
+
+def test_extract_pdf_parallel():
+    """Test multi-process PDF extraction matches serial extraction."""
+    pdf_path = 'tests/test_data/sample.pdf'
+    serial = Extractor(cache_size=0, max_workers=1).extract(pdf_path)
+    
+    extractor = Extractor(cache_size=0, max_workers=2)
+    extractor.PARALLEL_MIN_PAGES = 2
+    parallel = extractor.extract(pdf_path)
+    
+    assert parallel.pages == serial.pages
+    assert parallel.total_chars == serial.total_chars
+
+
+def test_extract_empty_txt(tmp_path):
+    """Test extracting an empty text file."""
+    txt_path = tmp_path / "empty.txt"
+    txt_path.write_bytes(b"")
+    
+    doc = Extractor().extract(str(txt_path))
+    assert len(doc.pages) == 1
+    assert doc.pages[0].text == ""
+    assert doc.total_chars == 0
+
+
+def test_extract_shift_jis_txt(tmp_path):
+    """Test a Shift_JIS file falls back past UTF-8."""
+    txt_path = tmp_path / "sjis.txt"
+    text = "機械学習は人工知能の一分野です。データから学習します。"
+    txt_path.write_bytes(text.encode('shift_jis'))
+    
+    doc = Extractor().extract(str(txt_path))
+    assert doc.pages[0].text == text
@@ -4,33 +4,47 @@ import pytest
 import numpy as np
 from pathlib import Path
 import tempfile
+import pickle
+import faiss
 
-from src.indexing.index_store import FAISSIndexStore
+from src.indexing.index_store import FAISSIndexStore, MAP_MAGIC
+
+
+# Deterministic unit-length sample embeddings, built once at import.
+# Gaussian vectors in 384 dimensions are nearly orthogonal, so each one's
+# nearest neighbour is itself by a wide margin.
+_EMB = np.random.default_rng(0).standard_normal((10, 384), dtype=np.float32)
+faiss.normalize_L2(_EMB)
+# Shared between tests, so make accidental in-place edits fail
+_EMB.flags.writeable = False
+
+
+@pytest.fixture(scope="module")
+def dimension():
+    """Embedding dimension for testing."""
+    return 384
+
+
+@pytest.fixture(scope="module")
+def sample_embeddings():
+    """Sample embeddings shared by the module (read-only)."""
+    return _EMB
+
+
+@pytest.fixture(scope="module")
+def sample_chunk_ids():
+    """Create sample chunk IDs."""
+    return [f"chunk_{i}" for i in range(10)]
 
 
 class TestFAISSIndexStore:
     """Test FAISS index management."""
     
-    @pytest.fixture
-    def dimension(self):
-        """Embedding dimension for testing."""
-        return 384
-    
     @pytest.fixture
     def index_store(self, dimension):
         """Create index store instance."""
         return FAISSIndexStore(dimension=dimension, index_type='Flat')
     
-    @pytest.fixture
-    def sample_embeddings(self, dimension):
-        """Create sample embeddings."""
-        return np.random.rand(10, dimension).astype('float32')
-    
-    @pytest.fixture
-    def sample_chunk_ids(self):
-        """Create sample chunk IDs."""
-        return [f"chunk_{i}" for i in range(10)]
-    
     def test_initialization(self, index_store):
         """Test index store initializes correctly."""
         assert index_store.dimension == 384
@@ -44,12 +58,107 @@ class TestFAISSIndexStore:
         assert index_store.index is not None
         assert index_store.index.ntotal == 0
     
+    def test_flat_inner_product_matches_l2_ranking(self, index_store, sample_chunk_ids, sample_embeddings):
+        """Test Flat scores are cosine similarities ranked like L2 distance."""
+        index_store.add(sample_chunk_ids, sample_embeddings)
+        assert index_store.index.metric_type == faiss.METRIC_INNER_PRODUCT
+        
+        query = np.random.default_rng(2).standard_normal(384).astype('float32')
+        results = index_store.search(query, k=10)
+        
+        unit_query = query / np.linalg.norm(query)
+        distances = np.linalg.norm(sample_embeddings - unit_query, axis=1)
+        assert [chunk_id for chunk_id, _ in results] == [
+            sample_chunk_ids[i] for i in np.argsort(distances)
+        ]
+        scores = np.array([score for _, score in results])
+        np.testing.assert_allclose(scores, 1 - np.sort(distances) ** 2 / 2, atol=1e-5)
+    
+    @pytest.mark.slow
     def test_create_hnsw_index(self, dimension):
         """Test creating an HNSW index."""
         store = FAISSIndexStore(dimension=dimension, index_type='HNSW')
         store.create_index()
         assert store.index is not None
     
+    def test_create_ivf_index(self, dimension):
+        """Test creating an IVF index with inner product metric."""
+        store = FAISSIndexStore(dimension=dimension, index_type='IVF', nlist=8)
+        store.create_index()
+        assert store.index.nlist == 8
+        assert store.index.nprobe == FAISSIndexStore.IVF_NPROBE
+        assert store.index.metric_type == faiss.METRIC_INNER_PRODUCT
+    
+    def test_ivf_add_and_search(self, dimension):
+        """Test IVF index trains on first add and finds vectors."""
+        store = FAISSIndexStore(dimension=dimension, index_type='IVF', nlist=8)
+        embeddings = np.random.rand(500, dimension).astype('float32')
+        chunk_ids = [f"chunk_{i}" for i in range(500)]
+        store.add(chunk_ids, embeddings)
+        
+        assert store.index.is_trained
+        assert store.size == 500
+        results = store.search(embeddings[42].copy(), k=3)
+        assert results[0][0] == "chunk_42"
+    
+    def test_sq8_add_and_search(self, dimension):
+        """Test SQ8 index trains on first add and finds vectors."""
+        store = FAISSIndexStore(dimension=dimension, index_type='SQ8')
+        embeddings = np.random.rand(100, dimension).astype('float32')
+        chunk_ids = [f"chunk_{i}" for i in range(100)]
+        store.add(chunk_ids, embeddings)
+        
+        assert store.index.is_trained
+        assert store.index.metric_type == faiss.METRIC_INNER_PRODUCT
+        assert store.size == 100
+        
+        results = store.search(embeddings[42].copy(), k=3)
+        assert results[0][0] == "chunk_42"
+        # 8-bit quantization costs a little precision
+        assert results[0][1] >= 0.93
+    
+    def test_sqfp16_add_and_search(self, dimension, sample_chunk_ids, sample_embeddings):
+        """Test half-precision index accepts float16 embeddings."""
+        store = FAISSIndexStore(dimension=dimension, index_type='SQfp16')
+        embeddings = sample_embeddings.astype('float16')
+        store.add(sample_chunk_ids, embeddings)
+        
+        assert store.size == 10
+        assert store.index.code_size == dimension * 2
+        
+        results = store.search(embeddings[3], k=2)
+        assert results[0][0] == "chunk_3"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+    
+    def test_sq8_save_and_load(self, dimension, tmp_path):
+        """Test SQ8 index round-trips through save and load."""
+        store = FAISSIndexStore(dimension=dimension, index_type='SQ8')
+        embeddings = np.random.rand(20, dimension).astype('float32')
+        store.add([f"chunk_{i}" for i in range(20)], embeddings)
+        store.save(tmp_path / "test.index", tmp_path / "test.map")
+        
+        loaded = FAISSIndexStore(dimension=dimension)
+        loaded.load(tmp_path / "test.index", tmp_path / "test.map")
+        assert loaded.index_type == 'SQ8'
+        assert loaded.search(embeddings[7].copy(), k=1)[0][0] == "chunk_7"
+    
+    def test_for_corpus_size(self, dimension):
+        """Test index type is chosen by corpus size."""
+        small = FAISSIndexStore.for_corpus_size(dimension, 1000)
+        assert small.index_type == 'Flat'
+        
+        large = FAISSIndexStore.for_corpus_size(dimension, 100_000)
+        assert large.index_type == 'IVF'
+        assert large.nlist == 4 * int(np.sqrt(100_000))
+    
+    def test_gpu_falls_back_to_cpu(self, dimension, sample_chunk_ids, sample_embeddings):
+        """Test GPU option works with or without a GPU."""
+        store = FAISSIndexStore(dimension=dimension, index_type='Flat', gpu=True)
+        store.add(sample_chunk_ids, sample_embeddings)
+        
+        results = store.search(sample_embeddings[0], k=3)
+        assert results[0][0] == "chunk_0"
+    
     def test_create_invalid_index_type(self, dimension):
         """Test creating index with invalid type."""
         store = FAISSIndexStore(dimension=dimension, index_type='InvalidType')
@@ -63,6 +172,9 @@ class TestFAISSIndexStore:
         assert index_store.size == 10
         assert len(index_store.chunk_id_map) == 10
         assert len(index_store.reverse_map) == 10
+        # FAISS IDs are positions in chunk_id_map
+        assert index_store.chunk_id_map == sample_chunk_ids
+        assert index_store.reverse_map["chunk_7"] == 7
     
     def test_add_single_vector(self, index_store):
         """Test adding a single vector."""
@@ -81,6 +193,8 @@ class TestFAISSIndexStore:
     
     def test_add_multiple_batches(self, index_store, dimension):
         """Test adding vectors in multiple batches."""
+        index_store.reserve(10)
+        
         # First batch
         ids1 = ["chunk_0", "chunk_1", "chunk_2"]
         emb1 = np.random.rand(3, dimension).astype('float32')
@@ -94,6 +208,24 @@ class TestFAISSIndexStore:
         assert index_store.size == 5
         assert all(cid in index_store.reverse_map for cid in ids1 + ids2)
     
+    def test_reserve(self, index_store, dimension):
+        """Test reserve keeps the index contents unchanged."""
+        emb = np.random.rand(4, dimension).astype('float32')
+        index_store.add([f"chunk_{i}" for i in range(4)], emb)
+        index_store.reserve(100)
+        assert index_store.size == 4
+        
+        index_store.add(["chunk_4"], np.random.rand(1, dimension).astype('float32'))
+        assert index_store.size == 5
+        assert index_store.search(emb[2].copy(), k=1)[0][0] == "chunk_2"
+    
+    @pytest.mark.slow
+    def test_reserve_hnsw_ignored(self, dimension):
+        """Test index types without a single vector buffer ignore reserve."""
+        hnsw = FAISSIndexStore(dimension=dimension, index_type='HNSW')
+        hnsw.reserve(100)
+        assert hnsw.size == 0
+    
     def test_search(self, index_store, sample_chunk_ids, sample_embeddings):
         """Test searching for similar vectors."""
         index_store.add(sample_chunk_ids, sample_embeddings)
@@ -110,6 +242,49 @@ class TestFAISSIndexStore:
         assert results[0][0] == "chunk_0"
         assert results[0][1] >= 0.95  # High similarity to itself
     
+    def test_parallel_slab_search(self, dimension, monkeypatch):
+        """Test slab-parallel Flat search matches a plain index search."""
+        monkeypatch.setattr(FAISSIndexStore, 'PARALLEL_SEARCH_MIN_VECTORS', 0)
+        monkeypatch.setattr(faiss, 'omp_get_max_threads', lambda: 4)
+        
+        store = FAISSIndexStore(dimension=dimension, index_type='Flat')
+        embeddings = np.random.rand(203, dimension).astype('float32')
+        store.add([f"chunk_{i}" for i in range(203)], embeddings)
+        
+        queries = np.random.rand(2, dimension).astype('float32')
+        faiss.normalize_L2(queries)
+        expected_scores, expected_indices = store.index.search(queries, 5)
+        scores, indices = store._search_index(queries, 5)
+        
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-5)
+        
+        results = store.search(embeddings[42].copy(), k=3)
+        assert results[0][0] == "chunk_42"
+    
+    def test_search_batch(self, index_store, sample_chunk_ids, sample_embeddings):
+        """Test searching several queries in one call."""
+        index_store.add(sample_chunk_ids, sample_embeddings)
+        
+        queries = sample_embeddings[:3].copy()
+        results = index_store.search_batch(queries, k=4)
+        
+        assert len(results) == 3
+        assert all(len(r) == 4 for r in results)
+        
+        # Each query should find itself first
+        assert [r[0][0] for r in results] == ["chunk_0", "chunk_1", "chunk_2"]
+        
+        # Queries are not normalized in place
+        assert np.array_equal(queries, sample_embeddings[:3])
+    
+    def test_search_batch_empty_index(self, index_store):
+        """Test batch search in empty index."""
+        queries = np.random.rand(3, 384).astype('float32')
+        results = index_store.search_batch(queries, k=5)
+        
+        assert results == [[], [], []]
+    
     def test_search_empty_index(self, index_store):
         """Test searching in empty index."""
         query = np.random.rand(384).astype('float32')
@@ -136,8 +311,9 @@ class TestFAISSIndexStore:
         assert index_store.has_chunk("chunk_5")
         assert not index_store.has_chunk("nonexistent")
     
-    def test_save_and_load(self, index_store, sample_chunk_ids, sample_embeddings):
-        """Test saving and loading index."""
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_save_and_load(self, index_store, sample_chunk_ids, sample_embeddings, mmap):
+        """Test saving and loading index, read or memory-mapped."""
         with tempfile.TemporaryDirectory() as tmpdir:
             index_path = Path(tmpdir) / "test.index"
             map_path = Path(tmpdir) / "test.map"
@@ -151,10 +327,11 @@ class TestFAISSIndexStore:
             
             # Load into new instance
             new_store = FAISSIndexStore(dimension=384, index_type='Flat')
-            new_store.load(index_path, map_path)
+            new_store.load(index_path, map_path, mmap=mmap)
             
             assert new_store.size == 10
             assert len(new_store.chunk_id_map) == 10
+            assert new_store.reverse_map["chunk_3"] == 3
             assert new_store.dimension == 384
             
             # Search should work
@@ -162,6 +339,110 @@ class TestFAISSIndexStore:
             results = new_store.search(query, k=5)
             assert len(results) == 5
             assert results[0][0] == "chunk_0"
+            
+            # Release any mapping before the temp dir is removed
+            del new_store
+    
+    def test_mapping_file_format(self, index_store, tmp_path):
+        """Test the mapping file is binary (not pickle) and round-trips."""
+        chunk_ids = ["chunk_a", "文書_1", "chunk with spaces"]
+        index_store.add(chunk_ids, np.random.rand(3, 384).astype('float32'))
+        index_store.save(tmp_path / "test.index", tmp_path / "test.map")
+        
+        assert (tmp_path / "test.map").read_bytes().startswith(MAP_MAGIC)
+        
+        new_store = FAISSIndexStore(dimension=384)
+        new_store.load(tmp_path / "test.index", tmp_path / "test.map")
+        assert new_store.chunk_id_map == chunk_ids
+        # reverse_map is only built when first needed
+        assert new_store._reverse_map is None
+        assert new_store.has_chunk("文書_1")
+        assert new_store.reverse_map["chunk with spaces"] == 2
+    
+    def test_mapping_rejects_nul_ids(self, index_store, tmp_path):
+        """Test chunk IDs containing NUL cannot be saved."""
+        index_store.add(["bad\0id"], np.random.rand(1, 384).astype('float32'))
+        with pytest.raises(ValueError):
+            index_store.save(tmp_path / "test.index", tmp_path / "test.map")
+    
+    def test_load_legacy_mapping(self, index_store, sample_chunk_ids, sample_embeddings, tmp_path):
+        """Test loading a mapping file that stores both dicts."""
+        index_path = tmp_path / "test.index"
+        map_path = tmp_path / "test.map"
+        index_store.add(sample_chunk_ids, sample_embeddings)
+        index_store.save(index_path, map_path)
+        
+        with open(map_path, 'wb') as f:
+            pickle.dump({
+                'chunk_id_map': dict(enumerate(index_store.chunk_id_map)),
+                'reverse_map': dict(index_store.reverse_map),
+                'next_id': 10,
+                'dimension': 384,
+                'index_type': 'Flat'
+            }, f)
+        
+        new_store = FAISSIndexStore(dimension=384)
+        new_store.load(index_path, map_path)
+        assert new_store.chunk_id_map == index_store.chunk_id_map
+        assert new_store.reverse_map == index_store.reverse_map
+    
+    def test_load_mmap(self, index_store, sample_chunk_ids, sample_embeddings):
+        """Test loading a memory-mapped index."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index_path = Path(tmpdir) / "test.index"
+            map_path = Path(tmpdir) / "test.map"
+            
+            index_store.add(sample_chunk_ids, sample_embeddings)
+            index_store.save(index_path, map_path)
+            
+            new_store = FAISSIndexStore(dimension=384, index_type='Flat')
+            new_store.load(index_path, map_path, mmap=True)
+            
+            assert new_store.size == 10
+            if Path('/proc/self/maps').exists():
+                assert str(index_path) in Path('/proc/self/maps').read_text()
+            results = new_store.search(sample_embeddings[0], k=5)
+            assert results[0][0] == "chunk_0"
+            
+            # Adding copies the index into memory first
+            extra = np.random.rand(1, 384).astype('float32')
+            new_store.add(["chunk_10"], extra)
+            assert new_store.size == 11
+            assert new_store.has_chunk("chunk_10")
+            
+            # Release the mapping before the temp dir is removed
+            del new_store
+    
+    @pytest.mark.parametrize("index_type", ["Flat", "SQ8", "IVF"])
+    def test_save_over_mmapped_index(self, dimension, tmp_path, index_type):
+        """Test saving over a memory-mapped index leaves the mapping usable."""
+        index_path = tmp_path / "test.index"
+        map_path = tmp_path / "test.map"
+        embeddings = np.random.default_rng(3).standard_normal((200, dimension)).astype('float32')
+        chunk_ids = [f"chunk_{i}" for i in range(200)]
+        
+        store = FAISSIndexStore(dimension=dimension, index_type=index_type, nlist=4)
+        store.add(chunk_ids, embeddings)
+        store.save(index_path, map_path)
+        
+        mapped = FAISSIndexStore(dimension=dimension)
+        mapped.load(index_path, map_path, mmap=True)
+        
+        # A truncating overwrite here used to crash the search with SIGBUS
+        smaller = FAISSIndexStore(dimension=dimension, index_type=index_type, nlist=4)
+        smaller.add(chunk_ids[:20], embeddings[:20])
+        smaller.save(index_path, map_path)
+        
+        assert mapped.search(embeddings[150].copy(), k=1)[0][0] == "chunk_150"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["test.index", "test.map"]
+        
+        # Modifying the mapped store copies the old index, not the new file
+        mapped.add(["extra"], embeddings[:1])
+        assert mapped.size == 201
+        
+        reloaded = FAISSIndexStore(dimension=dimension)
+        reloaded.load(index_path, map_path, mmap=True)
+        assert reloaded.size == 20
     
     def test_load_nonexistent_index(self, index_store):
         """Test loading nonexistent index files."""
@@ -199,6 +480,49 @@ class TestFAISSIndexStore:
         assert not index_store.has_chunk("chunk_5")
         assert index_store.has_chunk("chunk_1")
         assert index_store.has_chunk("chunk_2")
+        
+        # Remaining vectors still map to the right chunks
+        results = index_store.search(sample_embeddings[6], k=1)
+        assert results[0][0] == "chunk_6"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    
+    @pytest.mark.parametrize("index_type", [
+        "SQ8", "SQfp16", pytest.param("HNSW", marks=pytest.mark.slow)
+    ])
+    def test_remove_vectors_other_types(self, dimension, sample_chunk_ids, sample_embeddings, index_type):
+        """Test removal for SQ8 (in place) and HNSW (rebuilt)."""
+        store = FAISSIndexStore(dimension=dimension, index_type=index_type)
+        store.add(sample_chunk_ids, sample_embeddings)
+        store.remove(["chunk_0", "chunk_5"])
+        
+        assert store.size == 8
+        assert store.chunk_id_map == [c for c in sample_chunk_ids if c not in ("chunk_0", "chunk_5")]
+        assert store.search(sample_embeddings[8], k=1)[0][0] == "chunk_8"
+    
+    def test_remove_ivf_in_place(self, dimension, tmp_path):
+        """Test IVF removal keeps the other IDs and survives save/load."""
+        store = FAISSIndexStore(dimension=dimension, index_type='IVF', nlist=4)
+        embeddings = np.random.default_rng(1).standard_normal((200, dimension), dtype=np.float32)
+        store.add([f"chunk_{i}" for i in range(200)], embeddings)
+        
+        store.remove(["chunk_3", "chunk_10"])
+        assert store.size == 198
+        assert not store.has_chunk("chunk_3")
+        assert store.reverse_map["chunk_11"] == 11
+        assert store.search(embeddings[11], k=1)[0][0] == "chunk_11"
+        assert store.search(embeddings[3], k=1)[0][0] != "chunk_3"
+        
+        # New vectors get fresh IDs, not the removed ones
+        store.add(["chunk_new"], embeddings[3:4])
+        assert store.reverse_map["chunk_new"] == 200
+        assert store.search(embeddings[3], k=1)[0][0] == "chunk_new"
+        
+        store.save(tmp_path / "ivf.index", tmp_path / "ivf.map")
+        loaded = FAISSIndexStore(dimension=dimension)
+        loaded.load(tmp_path / "ivf.index", tmp_path / "ivf.map")
+        assert loaded.size == 199
+        assert not loaded.has_chunk("chunk_10")
+        assert loaded.search(embeddings[150], k=1)[0][0] == "chunk_150"
     
     def test_remove_nonexistent(self, index_store, sample_chunk_ids, sample_embeddings):
         """Test removing nonexistent chunks."""
@@ -240,6 +564,36 @@ class TestFAISSIndexStore:
         # Score should be close to 1 for the same vector
         assert results[0][1] >= 0.95
     
+    def test_normalization_leaves_input_unchanged(self, index_store, dimension):
+        """Test add and search normalize copies, not the caller's arrays."""
+        embeddings = np.random.rand(3, dimension) * 5  # float64, unnormalized
+        original = embeddings.copy()
+        index_store.add(["chunk_0", "chunk_1", "chunk_2"], embeddings)
+        np.testing.assert_array_equal(embeddings, original)
+        
+        query = embeddings[1].astype('float32')
+        query_copy = query.copy()
+        results = index_store.search(query, k=1)
+        np.testing.assert_array_equal(query, query_copy)
+        assert results[0][0] == "chunk_1"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    
+    def test_add_without_copy(self, index_store, dimension, sample_embeddings):
+        """Test copy=False normalizes suitable arrays in place."""
+        embeddings = np.random.rand(3, dimension).astype('float32')
+        index_store.add(["chunk_0", "chunk_1", "chunk_2"], embeddings, copy=False)
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-5)
+        
+        # Arrays that need converting (or are read-only) are still copied
+        as_float64 = np.random.rand(2, dimension)
+        original = as_float64.copy()
+        index_store.add(["chunk_3", "chunk_4"], as_float64, copy=False)
+        np.testing.assert_array_equal(as_float64, original)
+        index_store.add(["chunk_5"], sample_embeddings[:1], copy=False)
+        
+        assert index_store.size == 6
+        assert index_store.search(embeddings[1], k=1)[0][0] == "chunk_1"
+    
     def test_search_returns_sorted_results(self, index_store):
         """Test that search results are sorted by score."""
         # Create vectors with known similarities
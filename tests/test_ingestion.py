@@ -1,4 +1,5 @@
 """Tests for the ingestion module."""
+import os
 import pytest
 import tempfile
 import shutil
@@ -11,38 +12,39 @@ from src.indexing.ingestion import Ingestion
 
 @pytest.fixture
 def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
-    
-    db = Database(db_path)  # Auto-initializes in __init__
+    """Create an in-memory database for testing (nothing touches disk)."""
+    db = Database(":memory:")  # Auto-initializes in __init__
     
     yield db
     
-    # Cleanup - just delete the file
-    Path(db_path).unlink(missing_ok=True)
+    db.close()
 
 
-@pytest.fixture
-def temp_folder():
-    """Create a temporary folder with test files."""
-    temp_dir = tempfile.mkdtemp()
-    
-    # Create test files
-    Path(temp_dir, 'test1.pdf').write_text('PDF content')
-    Path(temp_dir, 'test2.txt').write_text('TXT content')
-    Path(temp_dir, 'test3.md').write_text('MD content')
-    Path(temp_dir, 'ignore.doc').write_text('DOC content')
-    
-    # Create subdirectory
-    sub_dir = Path(temp_dir, 'subdir')
-    sub_dir.mkdir()
-    Path(sub_dir, 'test4.pdf').write_text('Nested PDF')
+# Scan test tree: 3 root files + 1 nested match, plus one ignored file
+SCAN_TREE = ('test1.pdf', 'test2.txt', 'test3.md', 'ignore.doc', 'subdir/test4.pdf')
+
+
+def _make_tree(root: Path, paths) -> None:
+    """Create empty files (and their directories) under root.
     
-    yield temp_dir
+    The tests only look at names and extensions, so each file is a single
+    os.open/os.close with nothing written.
+    """
+    for rel_path in paths:
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o644))
+
+
+@pytest.fixture(scope="session")
+def temp_folder(tmp_path_factory):
+    """Create a folder with test files, shared by the session.
     
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    Tests must not modify it; tests that do build their own tree.
+    """
+    root = tmp_path_factory.mktemp("scan")
+    _make_tree(root, SCAN_TREE)
+    return str(root)
 
 
 def test_scan_folder_recursive(temp_folder):
@@ -68,6 +70,22 @@ def test_scan_folder_non_recursive(temp_folder):
     assert not any('test4.pdf' in f for f in files)
 
 
+def test_scan_folder_skips_symlinked_dirs(tmp_path):
+    """Test symlinked directories are not followed (no loops, no duplicates)."""
+    _make_tree(tmp_path, SCAN_TREE)
+    loop = Path(tmp_path, 'subdir', 'loop')
+    try:
+        loop.symlink_to(tmp_path, target_is_directory=True)
+    except OSError:
+        pytest.skip("Symlinks not supported")
+    
+    ingestion = Ingestion(None)
+    files = ingestion.scan_folder(str(tmp_path), recursive=True)
+    
+    assert len(files) == 4
+    assert all(Path(f).is_absolute() for f in files)
+
+
 def test_scan_empty_folder():
     """Test scanning empty folder."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -118,18 +136,32 @@ def test_add_duplicate_files(temp_db, temp_folder):
     assert updated2 == 0
 
 
-def test_add_modified_files(temp_db, temp_folder):
+def test_add_files_reports_failed_insert(temp_db, temp_folder):
+    """Test a path listed twice is added once and reported once."""
+    ingestion = Ingestion(temp_db)
+    files = ingestion.scan_folder(temp_folder)
+    
+    added, updated, errors = ingestion.add_files_to_db(files + files[:1])
+    
+    assert added == 4
+    assert updated == 0
+    assert len(errors) == 1
+    assert errors[0].startswith(files[0])
+
+
+def test_add_modified_files(temp_db, temp_folder, tmp_path):
     """Test adding modified files."""
     ingestion = Ingestion(temp_db)
-    test_file = Path(temp_folder, 'test1.pdf')
+    # Private copy, since the shared folder must not change
+    test_file = Path(shutil.copy(Path(temp_folder, 'test1.pdf'), tmp_path))
     
     # First add
     ingestion.add_files_to_db([str(test_file)])
     
-    # Modify file
-    import time
-    time.sleep(0.1)  # Ensure mtime changes
+    # Modify file, moving mtime forward instead of sleeping
     test_file.write_text('Modified content')
+    mtime = test_file.stat().st_mtime + 10
+    os.utime(test_file, (mtime, mtime))
     
     # Add again (should update)
     added, updated, _ = ingestion.add_files_to_db([str(test_file)])
@@ -164,15 +196,13 @@ def test_scan_and_add(temp_db, temp_folder):
     assert len(docs) == 4
 
 
-def test_custom_extensions(temp_db):
+def test_custom_extensions(temp_db, tmp_path):
     """Test custom file extensions."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create files with custom extensions
-        Path(temp_dir, 'test.custom').write_text('Custom content')
-        Path(temp_dir, 'test.pdf').write_text('PDF content')
-        
-        ingestion = Ingestion(temp_db, allowed_extensions=['.custom'])
-        files = ingestion.scan_folder(temp_dir)
-        
-        assert len(files) == 1
-        assert files[0].endswith('.custom')
+    # Create files with custom extensions
+    _make_tree(tmp_path, ('test.custom', 'test.pdf'))
+    
+    ingestion = Ingestion(temp_db, allowed_extensions=['.custom'])
+    files = ingestion.scan_folder(str(tmp_path))
+    
+    assert len(files) == 1
+    assert files[0].endswith('.custom')
@@ -1,27 +1,19 @@
 """Integration test for Phase 2 - End-to-end indexing pipeline."""
-import tempfile
-import shutil
-from pathlib import Path
 
 from src.core.database import Database
 from src.core.models import DocumentStatus, Chunk
 from src.indexing.ingestion import Ingestion
-from src.indexing.extractor import Extractor
-from src.indexing.chunker import Chunker
+from src.indexing.pipeline import extract_and_chunk
 
 
-def test_full_indexing_pipeline():
+def test_full_indexing_pipeline(tmp_path):
     """Test complete indexing pipeline from file scan to chunks in database."""
-    # Setup
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
-    
+    # Setup (pytest removes tmp_path)
+    db = None
     try:
         # Initialize components
-        db = Database(db_path)
+        db = Database(tmp_path / "test.db")
         ingestion = Ingestion(db)
-        extractor = Extractor()
-        chunker = Chunker(chunk_size=100, chunk_overlap=20)  # Small chunks for testing
         
         # Step 1: Scan and add test files
         test_folder = 'tests/test_data'
@@ -39,40 +31,38 @@ def test_full_indexing_pipeline():
         # Step 3: Process each document
         total_chunks_added = 0
         
-        for doc in pending_docs:
+        # Documents are extracted and chunked in parallel worker processes
+        for doc, chunks, error in extract_and_chunk(
+            pending_docs, chunk_size=100, chunk_overlap=20  # Small chunks for testing
+        ):
             print(f"\nProcessing: {doc.title}")
             
-            try:
-                # Extract text
-                extracted = extractor.extract(doc.path)
-                print(f"  - Extracted {len(extracted.pages)} pages, {extracted.total_chars} chars")
-                
-                # Chunk text
-                pages_data = [(page.page_number, page.text) for page in extracted.pages]
-                chunks = chunker.chunk_pages(pages_data)
-                print(f"  - Created {len(chunks)} chunks")
-                
-                # Add chunks to database
-                for chunk in chunks:
-                    chunk_obj = Chunk(
-                        id=None,  # Auto-generated
-                        document_id=doc.id,
-                        page=chunk.page_number,
-                        start_offset=chunk.start_offset,
-                        end_offset=chunk.end_offset,
-                        text=chunk.text,
-                        text_hash=chunk.text_hash
-                    )
-                    db.add_chunk(chunk_obj)
-                    total_chunks_added += 1
-                
-                # Update document status
-                db.update_document_status(doc.id, DocumentStatus.INDEXED)
-                print(f"  - Status: INDEXED")
-                
-            except Exception as e:
-                print(f"  - Error: {str(e)}")
-                db.update_document_status(doc.id, DocumentStatus.ERROR, str(e))
+            if error is not None:
+                print(f"  - Error: {str(error)}")
+                db.update_document_status(doc.id, DocumentStatus.ERROR, str(error))
+                continue
+            
+            print(f"  - Created {len(chunks)} chunks")
+            
+            # Add all of the document's chunks in one transaction
+            chunk_objs = [
+                Chunk(
+                    id=None,  # Auto-generated
+                    document_id=doc.id,
+                    page=chunk.page_number,
+                    start_offset=chunk.start_offset,
+                    end_offset=chunk.end_offset,
+                    text=chunk.text,
+                    text_hash=chunk.text_hash
+                )
+                for chunk in chunks
+            ]
+            db.add_chunks(chunk_objs)
+            total_chunks_added += len(chunk_objs)
+            
+            # Update document status
+            db.update_document_status(doc.id, DocumentStatus.INDEXED)
+            print(f"  - Status: INDEXED")
         
         print(f"\nTotal chunks added: {total_chunks_added}")
         assert total_chunks_added > 0
@@ -107,8 +97,13 @@ def test_full_indexing_pipeline():
         
     finally:
         # Cleanup
-        Path(db_path).unlink(missing_ok=True)
+        if db is not None:
+            db.close()
 
 
 if __name__ == '__main__':
-    test_full_indexing_pipeline()
+    import tempfile
+    from pathlib import Path
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_full_indexing_pipeline(Path(tmpdir))
@@ -0,0 +1,65 @@
+"""Tests for the parallel extract-and-chunk pipeline."""
+
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.core.models import Document, DocumentStatus
+from src.indexing.pipeline import extract_and_chunk
+
+TEST_DATA = Path(__file__).parent / "test_data"
+
+
+def _document(path: Path) -> Document:
+    """Create a pending document for a file."""
+    return Document(
+        id=str(uuid.uuid4()),
+        path=str(path),
+        title=path.name,
+        ext=path.suffix,
+        mtime=datetime.now(),
+        size=0,
+        status=DocumentStatus.PENDING,
+        error_message=None
+    )
+
+
+@pytest.fixture
+def documents():
+    """Sample documents plus one that cannot be extracted."""
+    docs = [_document(TEST_DATA / name) for name in ("sample.pdf", "sample.txt", "sample.md")]
+    docs.append(_document(TEST_DATA / "missing.txt"))
+    return docs
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_extract_and_chunk(documents, max_workers):
+    """Test every document is returned once, with chunks or an error."""
+    results = list(extract_and_chunk(documents, chunk_size=100, chunk_overlap=20, max_workers=max_workers))
+    
+    assert sorted(doc.id for doc, _, _ in results) == sorted(doc.id for doc in documents)
+    
+    by_title = {doc.title: (chunks, error) for doc, chunks, error in results}
+    for title in ("sample.pdf", "sample.txt", "sample.md"):
+        chunks, error = by_title[title]
+        assert error is None
+        assert len(chunks) > 0
+    
+    chunks, error = by_title["missing.txt"]
+    assert chunks is None
+    assert isinstance(error, Exception)
+
+
+def test_extract_and_chunk_matches_serial(documents):
+    """Test worker processes produce the same chunks as a serial run."""
+    docs = documents[:3]
+    serial = {doc.id: chunks for doc, chunks, _ in extract_and_chunk(docs, max_workers=1)}
+    parallel = {doc.id: chunks for doc, chunks, _ in extract_and_chunk(docs, max_workers=3)}
+    assert serial == parallel
+
+
+def test_extract_and_chunk_empty():
+    """Test no documents yields nothing."""
+    assert list(extract_and_chunk([])) == []
@@ -3,52 +3,57 @@
 import pytest
 import numpy as np
 from datetime import datetime
-from pathlib import Path
-import tempfile
 
-from src.search.retriever import Retriever, SearchResult
+from src.search.retriever import (
+    Retriever, SearchResult, _fuse_scores, _fuse_scores_numpy, _top_k_order
+)
 from src.core.database import Database
-from src.core.models import Document, Chunk
+from src.core.models import Document, DocumentStatus, Chunk
 from src.indexing.embedder import Embedder
 from src.indexing.index_store import FAISSIndexStore
 
 
-@pytest.fixture
+# Fixed timestamp so the fixture data does not depend on when tests run
+_FIXTURE_NOW = datetime(2024, 1, 1)
+
+
+# Everything below is built once per module: the database (in memory, chunks
+# indexed into FTS5 in a single transaction), the chunk embeddings and the
+# FAISS index. Tests must not modify them.
+
+@pytest.fixture(scope="module")
 def test_db():
-    """Create a test database."""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = Path(f.name)
-    
-    db = Database(db_path)
+    """Create an in-memory test database shared by the module."""
+    db = Database(":memory:")
     yield db
     
     db.close()
-    db_path.unlink()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_documents(test_db):
-    """Create sample documents."""
+    """Create sample documents (added in one batch)."""
     docs = []
     for i in range(3):
         doc = Document(
             id=f"doc_{i}",
             path=f"/test/doc_{i}.txt",
-            name=f"doc_{i}.txt",
-            status="indexed",
+            title=f"doc_{i}.txt",
+            ext=".txt",
+            mtime=_FIXTURE_NOW,
             size=1000,
-            modified=datetime.now(),
-            indexed_at=datetime.now()
+            status=DocumentStatus.INDEXED,
+            error_message=None
         )
-        test_db.add_document(doc)
         docs.append(doc)
     
+    test_db.add_documents(docs)
     return docs
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_chunks(test_db, sample_documents):
-    """Create sample chunks."""
+    """Create sample chunks (added in one batch)."""
     chunks = []
     texts = [
         "Machine learning is a subset of artificial intelligence",
@@ -64,47 +69,34 @@ def sample_chunks(test_db, sample_documents):
         chunk = Chunk(
             id=f"chunk_{i}",
             document_id=doc_id,
-            text=text,
-            tokenized_text=text.lower(),
-            char_count=len(text),
-            position=i,
-            page_number=1,
+            page=1,
             start_offset=0,
-            end_offset=len(text)
+            end_offset=len(text),
+            text=text,
+            text_hash=f"hash_{i}"
         )
-        test_db.add_chunk(chunk)
         chunks.append(chunk)
     
+    test_db.add_chunks(chunks)
     return chunks
 
 
-@pytest.fixture
-def embedder():
-    """Create embedder instance."""
-    return Embedder(model_name='all-MiniLM-L6-v2')
-
-
-@pytest.fixture
-def index_store(embedder):
-    """Create FAISS index store."""
-    return FAISSIndexStore(dimension=embedder.dimension, index_type='Flat')
-
-
-@pytest.fixture
-def indexed_store(index_store, embedder, sample_chunks):
-    """Create index store with sample data."""
-    # Generate embeddings
+@pytest.fixture(scope="module", params=['Flat', 'SQ8'])
+def indexed_store(request, embedder, cached_embed_batch, sample_chunks):
+    """Create index store with sample data, exact and 8-bit quantized."""
+    # Embed all chunks in one batch (cached on disk across runs)
     texts = [chunk.text for chunk in sample_chunks]
-    embeddings = embedder.embed_batch(texts)
+    embeddings = cached_embed_batch(texts)
     
     # Add to index
+    index_store = FAISSIndexStore(dimension=embedder.dimension, index_type=request.param)
     chunk_ids = [chunk.id for chunk in sample_chunks]
-    index_store.add(chunk_ids, embeddings)
+    index_store.add(chunk_ids, embeddings, copy=False)
     
     return index_store
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def retriever(test_db, embedder, indexed_store):
     """Create retriever instance."""
     return Retriever(db=test_db, embedder=embedder, index_store=indexed_store)
@@ -148,6 +140,29 @@ class TestRetriever:
         # Should find ML-related content
         assert any("learning" in r.chunk.text.lower() for r in results)
     
+    def test_semantic_search_caches_query_embedding(self, test_db, embedder, indexed_store, monkeypatch):
+        """Test repeated queries are embedded only once."""
+        retriever = Retriever(db=test_db, embedder=embedder, index_store=indexed_store)
+        calls = []
+        original = embedder.embed_batch
+        
+        def counting_embed_batch(texts, *args, **kwargs):
+            calls.append(list(texts))
+            return original(texts, *args, **kwargs)
+        
+        monkeypatch.setattr(embedder, "embed_batch", counting_embed_batch)
+        
+        first = retriever.semantic_search("neural networks", limit=3)
+        second = retriever.semantic_search("neural networks", limit=3)
+        retriever.semantic_search_batch(["neural networks", "databases"], limit=3)
+        
+        assert calls == [["neural networks"], ["databases"]]
+        assert [r.chunk.id for r in first] == [r.chunk.id for r in second]
+        
+        retriever.clear_query_cache()
+        retriever.semantic_search("neural networks", limit=3)
+        assert len(calls) == 3
+    
     def test_semantic_search_empty_query(self, retriever):
         """Test semantic search with empty query."""
         results = retriever.semantic_search("", limit=5)
@@ -248,6 +263,13 @@ class TestRetriever:
         normalized = retriever._normalize_scores(scores)
         assert all(s == 1.0 for s in normalized)
     
+    def test_normalize_scores_array(self, retriever):
+        """Test score normalization accepts NumPy arrays."""
+        scores = np.array([1.0, 3.0, 2.0], dtype=np.float32)
+        normalized = retriever._normalize_scores(scores)
+        assert isinstance(normalized, list)
+        assert normalized == [0.0, 1.0, 0.5]
+    
     def test_get_chunk_context(self, retriever, sample_chunks):
         """Test getting chunk context."""
         # Get context for middle chunk
@@ -294,27 +316,43 @@ class TestRetriever:
         assert snippet == chunk.text
         assert "..." not in snippet
     
-    def test_format_result_snippet_long_text(self, retriever, test_db, sample_documents):
+    def test_format_result_snippet_long_text(self, retriever, sample_documents):
         """Test formatting snippet for long text."""
         long_text = "Lorem ipsum " * 100
+        # Not added to the shared database; formatting only needs the chunk
         chunk = Chunk(
             id="long_chunk",
             document_id=sample_documents[0].id,
-            text=long_text,
-            tokenized_text=long_text.lower(),
-            char_count=len(long_text),
-            position=0,
-            page_number=1,
+            page=1,
             start_offset=0,
-            end_offset=len(long_text)
+            end_offset=len(long_text),
+            text=long_text,
+            text_hash="hash_long"
         )
-        test_db.add_chunk(chunk)
         
         snippet = retriever.format_result_snippet(chunk, "ipsum", snippet_length=50)
         
         assert len(snippet) <= 53
         assert "..." in snippet
     
+    def test_format_result_snippet_ignores_case(self, retriever, sample_documents):
+        """Test snippet centers on a query word regardless of case."""
+        long_text = "x" * 300 + " Neural Networks " + "y" * 300
+        chunk = Chunk(
+            id="case_chunk",
+            document_id=sample_documents[0].id,
+            page=1,
+            start_offset=0,
+            end_offset=len(long_text),
+            text=long_text,
+            text_hash="hash_case"
+        )
+        
+        snippet = retriever.format_result_snippet(chunk, "NEURAL", snippet_length=50)
+        
+        assert "Neural" in snippet
+        assert chunk.lower_text == long_text.lower()
+    
     def test_search_result_dataclass(self, sample_chunks):
         """Test SearchResult dataclass."""
         result = SearchResult(
@@ -363,3 +401,65 @@ class TestRetriever:
         # All results should be unique
         chunk_ids = [r.chunk.id for r in hybrid_results]
         assert len(chunk_ids) == len(set(chunk_ids))
+
+
+class TestFuseScores:
+    """Test hybrid score fusion."""
+    
+    @pytest.mark.parametrize("fuse", [_fuse_scores, _fuse_scores_numpy])
+    def test_fuse_scores(self, fuse):
+        """Test scores are combined and ranked with stable ties."""
+        fused, order = fuse(
+            np.array([0, 1], dtype=np.int64),
+            np.array([1.0, 0.0]),
+            np.array([1, 2], dtype=np.int64),
+            np.array([1.0, 1.0]),
+            3,
+            0.5,
+            0.5,
+            3
+        )
+        
+        assert fused.tolist() == [0.5, 0.5, 0.5]
+        assert order.tolist() == [0, 1, 2]
+    
+    @pytest.mark.parametrize("fuse", [_fuse_scores, _fuse_scores_numpy])
+    def test_fuse_scores_ranking(self, fuse):
+        """Test chunks found by both searches rank first."""
+        fused, order = fuse(
+            np.array([0, 1, 2], dtype=np.int64),
+            np.array([3.0, 2.0, 1.0]),  # Normalized to 1.0, 0.5, 0.0
+            np.array([1], dtype=np.int64),
+            np.array([0.3]),  # A single score normalizes to 1.0
+            3,
+            0.5,
+            0.5,
+            10
+        )
+        
+        assert order.tolist() == [1, 0, 2]
+        assert fused[1] == pytest.approx(0.75)
+    
+    @pytest.mark.parametrize("fuse", [_fuse_scores, _fuse_scores_numpy])
+    def test_fuse_scores_limit(self, fuse):
+        """Test only the top results are ranked, with stable ties at the cut."""
+        fused, order = fuse(
+            np.array([0, 1, 2, 3, 4], dtype=np.int64),
+            np.array([0.2, 0.8, 0.5, 0.8, 0.5]),
+            np.array([], dtype=np.int64),
+            np.array([]),
+            5,
+            1.0,
+            0.0,
+            3
+        )
+        
+        assert order.tolist() == [1, 3, 2]
+    
+    def test_top_k_order_matches_stable_sort(self):
+        """Test partial ranking agrees with a full stable sort."""
+        rng = np.random.default_rng(0)
+        scores = rng.integers(0, 5, size=200).astype(np.float64)
+        for k in (0, 1, 7, 50, 200, 300):
+            expected = np.argsort(-scores, kind='mergesort')[:k]
+            assert _top_k_order(scores, k).tolist() == expected.tolist()
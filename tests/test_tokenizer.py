@@ -9,6 +9,11 @@ def test_tokenizer_initialization():
     assert tokenizer is not None
 
 
+def test_tokenizers_share_mecab():
+    """Test the MeCab dictionary is loaded once for all tokenizers."""
+    assert Tokenizer().mecab is Tokenizer().mecab
+
+
 def test_detect_japanese():
     """Test Japanese character detection."""
     tokenizer = Tokenizer()
@@ -23,6 +28,16 @@ def test_detect_japanese():
     assert not tokenizer._contains_japanese("Hello World")
     assert not tokenizer._contains_japanese("Python programming")
     assert not tokenizer._contains_japanese("123456")
+    assert not tokenizer._contains_japanese("Café naïve résumé")
+
+
+def test_detect_japanese_extended_ranges():
+    """Test detection of halfwidth Katakana and rarer Kanji blocks."""
+    tokenizer = Tokenizer()
+    
+    assert tokenizer._contains_japanese("ｶﾀｶﾅ")  # Halfwidth Katakana
+    assert tokenizer._contains_japanese("\u3400")  # CJK Extension A
+    assert tokenizer._contains_japanese("\uf929")  # CJK compatibility ideograph
 
 
 def test_tokenize_english():
@@ -114,3 +129,112 @@ def test_tokenize_special_characters():
     
     assert isinstance(result, str)
     assert len(result) > 0
+
+
+def test_parse_returns_both_forms():
+    """Test parse returns the joined string and the token list."""
+    tokenizer = Tokenizer()
+    
+    text = "機械学習はPythonで実装できます"
+    tokenized, tokens = tokenizer.parse(text)
+    
+    assert tokenized == tokenizer.tokenize(text)
+    assert tokens == tokenizer.get_tokens_list(text)
+    assert tokens == tokenized.split()
+
+
+def test_parse_empty():
+    """Test parse with empty input."""
+    tokenizer = Tokenizer()
+    
+    assert tokenizer.parse("") == ("", [])
+    assert tokenizer.parse(None) == ("", [])
+
+
+def test_parse_reuses_last_result():
+    """Test back-to-back calls on the same text only tokenize once."""
+    tokenizer = Tokenizer()
+    calls = []
+    original = tokenizer._contains_japanese
+    
+    def counting_contains_japanese(text):
+        calls.append(text)
+        return original(text)
+    
+    tokenizer._contains_japanese = counting_contains_japanese
+    
+    text = "自然言語処理とRAGアプリケーション"
+    tokenizer.tokenize(text)
+    tokens = tokenizer.get_tokens_list(text)
+    
+    assert len(calls) == 1
+    
+    # Mutating the returned list must not affect later results
+    tokens.append("extra")
+    assert "extra" not in tokenizer.get_tokens_list(text)
+    
+    tokenizer.tokenize("別のテキスト")
+    assert len(calls) == 2
+
+
+def test_parse_cache_is_lru():
+    """Test earlier texts stay cached until evicted or cleared."""
+    tokenizer = Tokenizer()
+    tokenizer.CACHE_SIZE = 2
+    calls = []
+    original = tokenizer._contains_japanese
+    
+    def counting_contains_japanese(text):
+        calls.append(text)
+        return original(text)
+    
+    tokenizer._contains_japanese = counting_contains_japanese
+    
+    tokenizer.tokenize("first")
+    tokenizer.tokenize("second")
+    tokenizer.tokenize("first")
+    assert calls == ["first", "second"]
+    
+    # "second" is now least recently used and gets evicted
+    tokenizer.tokenize("third")
+    tokenizer.tokenize("first")
+    tokenizer.tokenize("second")
+    assert calls == ["first", "second", "third", "second"]
+    
+    tokenizer.cache_clear()
+    tokenizer.tokenize("first")
+    assert calls[-1] == "first"
+    assert len(calls) == 5
+
+
+def test_parse_cache_skips_long_texts():
+    """Test page-sized texts are tokenized without being cached."""
+    tokenizer = Tokenizer()
+    long_text = "長い文章です。" * (Tokenizer.CACHE_MAX_LENGTH // 7 + 1)
+    
+    tokens = tokenizer.get_tokens_list(long_text)
+    
+    assert tokens == tokenizer.tokenize(long_text).split()
+    assert long_text not in tokenizer._cache
+    
+    tokenizer.tokenize("短いクエリ")
+    assert list(tokenizer._cache) == ["短いクエリ"]
+
+
+def test_parse_cache_thread_safe():
+    """Test concurrent callers sharing a tokenizer do not corrupt the cache."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    tokenizer = Tokenizer()
+    tokenizer.CACHE_SIZE = 8
+    texts = [f"query {i} 検索" for i in range(64)]
+    
+    def work(offset):
+        for i in range(500):
+            text = texts[(offset + i) % len(texts)]
+            assert tokenizer.tokenize(text).split() == tokenizer.get_tokens_list(text)
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(work, range(4)))
+    
+    assert len(tokenizer._cache) <= 8